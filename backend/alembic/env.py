@@ -8,6 +8,8 @@ from dotenv import load_dotenv
 from backend.models import CartItem, Order, OrderItem, Product, User, Cart
 # 1. Import your Base
 from backend.db.base import Base
+from backend.db.migrations import LOCK_TIMEOUT
+from backend.db.dialect import async_database_url
 
 # 2. Load the .env file
 load_dotenv(".env")
@@ -18,12 +20,19 @@ config = context.config
 # 3. Get the DATABASE_URL from environment and inject it into Alembic config
 database_url = os.getenv("DATABASE_URL")
 
-# Neon/Heroku fix: SQLAlchemy requires 'postgresql://' not 'postgres://'
-if database_url and database_url.startswith("postgres://"):
-    database_url = database_url.replace("postgres://", "postgresql://", 1)
-
+# postgres:// (Neon/Heroku) and postgresql:// URLs go through the same async
+# driver the app uses, since migrations run on an async engine below
 if database_url:
-    config.set_main_option("sqlalchemy.url", database_url)
+    config.set_main_option(
+        "sqlalchemy.url",
+        async_database_url(database_url).render_as_string(hide_password=False).replace("%", "%%"),
+    )
+
+# ONLINE_MIGRATIONS=1 for production deploys against live traffic: every
+# migration commits on its own, and DDL gives up on a busy lock after
+# MIGRATION_LOCK_TIMEOUT instead of stalling every query queued behind it.
+# See backend/db/migrations.py for the CONCURRENTLY/backfill helpers.
+ONLINE_MIGRATIONS = os.getenv("ONLINE_MIGRATIONS", "0") == "1"
 
 # Interpret the config file for Python logging.
 if config.config_file_name is not None:
@@ -64,9 +73,14 @@ def run_migrations_online() -> None:
             await connection.run_sync(do_run_migrations_sync)
 
     def do_run_migrations_sync(connection):
+        if ONLINE_MIGRATIONS and connection.dialect.name == "postgresql":
+            connection.exec_driver_sql(f"SET lock_timeout = '{LOCK_TIMEOUT}'")
+            connection.commit()
+
         context.configure(
             connection=connection, 
-            target_metadata=target_metadata
+            target_metadata=target_metadata,
+            transaction_per_migration=ONLINE_MIGRATIONS,
         )
 
         with context.begin_transaction():
@@ -0,0 +1,34 @@
+"""add_product_sorting_indexes
+
+Revision ID: 3a7c1d9e4b21
+Revises: 1ee1e6c99610
+Create Date: 2026-10-19 09:12:40.118203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3a7c1d9e4b21'
+down_revision: Union[str, Sequence[str], None] = '1ee1e6c99610'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('products', sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True))
+    op.create_index(op.f('ix_products_created_at'), 'products', ['created_at'], unique=False)
+    op.create_index('ix_products_category_id_price', 'products', ['category_id', 'price'], unique=False)
+    op.create_index('ix_products_price', 'products', ['price'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_products_price', table_name='products')
+    op.drop_index('ix_products_category_id_price', table_name='products')
+    op.drop_index(op.f('ix_products_created_at'), table_name='products')
+    op.drop_column('products', 'created_at')
@@ -0,0 +1,45 @@
+"""add_category_product_counts
+
+Revision ID: 8b2e5f0c7d43
+Revises: 3a7c1d9e4b21
+Create Date: 2026-10-19 10:04:17.502861
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b2e5f0c7d43'
+down_revision: Union[str, Sequence[str], None] = '3a7c1d9e4b21'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'category_product_counts',
+        sa.Column('category_id', sa.Integer(), nullable=False),
+        sa.Column('active_count', sa.Integer(), server_default='0', nullable=False),
+        sa.ForeignKeyConstraint(['category_id'], ['categories.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('category_id'),
+    )
+
+    # Seed one row per existing category with its current active product count
+    op.execute(
+        """
+        INSERT INTO category_product_counts (category_id, active_count)
+        SELECT c.id, COUNT(p.id)
+        FROM categories c
+        LEFT JOIN products p ON p.category_id = c.id AND p.is_active
+        GROUP BY c.id
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('category_product_counts')
@@ -0,0 +1,38 @@
+"""add_cart_last_active_at
+
+Revision ID: a9e4c7b2d158
+Revises: f5c2d8e9a314
+Create Date: 2026-10-19 17:48:31.205664
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from backend.db.migrations import create_index_concurrently, drop_index_concurrently, with_lock_timeout
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a9e4c7b2d158'
+down_revision: Union[str, Sequence[str], None] = 'f5c2d8e9a314'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Existing carts start their TTL from the migration, not from epoch, so
+    # the first sweep doesn't wipe every cart at once. now() is evaluated
+    # once, so Postgres adds the column without rewriting the table. The
+    # default stays so inserts from code that predates the column still work.
+    with_lock_timeout(lambda: op.add_column(
+        'carts', sa.Column('last_active_at', sa.DateTime(), server_default=sa.func.now(), nullable=False)
+    ))
+    create_index_concurrently('ix_carts_last_active_at', 'carts', ['last_active_at'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    drop_index_concurrently('ix_carts_last_active_at', 'carts')
+    op.drop_column('carts', 'last_active_at')
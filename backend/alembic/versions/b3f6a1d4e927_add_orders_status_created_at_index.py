@@ -0,0 +1,31 @@
+"""add_orders_status_created_at_index
+
+Revision ID: b3f6a1d4e927
+Revises: a9e4c7b2d158
+Create Date: 2026-10-19 18:36:12.518830
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from backend.db.migrations import create_index_concurrently, drop_index_concurrently
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3f6a1d4e927'
+down_revision: Union[str, Sequence[str], None] = 'a9e4c7b2d158'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # orders is partitioned: indexed partition by partition without blocking checkout
+    create_index_concurrently('ix_orders_status_created_at', 'orders', ['status', 'created_at'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    drop_index_concurrently('ix_orders_status_created_at', 'orders')
@@ -0,0 +1,49 @@
+"""add_sales_rollup_tables
+
+Revision ID: c4d91a6e2f85
+Revises: 8b2e5f0c7d43
+Create Date: 2026-10-19 11:21:03.664120
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4d91a6e2f85'
+down_revision: Union[str, Sequence[str], None] = '8b2e5f0c7d43'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Tables start empty; fill them with `python -m backend.scripts.backfill_analytics`
+    op.create_table(
+        'daily_sales',
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('order_count', sa.Integer(), nullable=False),
+        sa.Column('items_sold', sa.Integer(), nullable=False),
+        sa.Column('revenue', sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint('day'),
+    )
+    op.create_table(
+        'daily_product_sales',
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('product_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('product_name', sa.String(), nullable=True),
+        sa.Column('category_id', sa.Integer(), nullable=True),
+        sa.Column('quantity', sa.Integer(), nullable=False),
+        sa.Column('revenue', sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint('day', 'product_id'),
+    )
+    op.create_index(op.f('ix_daily_product_sales_category_id'), 'daily_product_sales', ['category_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_daily_product_sales_category_id'), table_name='daily_product_sales')
+    op.drop_table('daily_product_sales')
+    op.drop_table('daily_sales')
@@ -0,0 +1,179 @@
+"""partition_orders_by_month
+
+Revision ID: d7f3b8a1c926
+Revises: c4d91a6e2f85
+Create Date: 2026-10-19 13:40:51.207394
+
+"""
+from datetime import datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from backend.db.partitions import (
+    PARTITIONS_AHEAD,
+    add_months,
+    month_start,
+    partition_statements,
+)
+
+# revision identifiers, used by Alembic.
+revision: str = 'd7f3b8a1c926'
+down_revision: Union[str, Sequence[str], None] = 'c4d91a6e2f85'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def create_partitioned_tables() -> None:
+    op.create_table(
+        'orders',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('total_amount', sa.Float(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('status', sa.String(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id', 'created_at'),
+        postgresql_partition_by='RANGE (created_at)',
+    )
+    op.create_index(op.f('ix_orders_user_id'), 'orders', ['user_id'], unique=False)
+
+    op.create_table(
+        'order_items',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('order_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('order_created_at', sa.DateTime(), nullable=False),
+        sa.Column('product_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('product_name', sa.String(), nullable=True),
+        sa.Column('product_price', sa.Float(), nullable=True),
+        sa.Column('quantity', sa.Integer(), nullable=True),
+        sa.Column('subtotal', sa.Float(), nullable=True),
+        sa.ForeignKeyConstraint(['order_id', 'order_created_at'], ['orders.id', 'orders.created_at']),
+        sa.PrimaryKeyConstraint('id', 'order_created_at'),
+        postgresql_partition_by='RANGE (order_created_at)',
+    )
+    op.create_index(op.f('ix_order_items_order_id'), 'order_items', ['order_id'], unique=False)
+
+
+def copy_window(bind, start, end) -> None:
+    # ON CONFLICT DO NOTHING: a rerun after a failed copy skips what's there
+    condition = 'o.created_at >= :start' + (' AND o.created_at < :end' if end else '')
+    params = {'start': start, 'end': end}
+    bind.execute(
+        sa.text(
+            f"""
+            INSERT INTO orders (id, user_id, total_amount, created_at, status)
+            SELECT o.id, o.user_id, o.total_amount, o.created_at, o.status
+            FROM orders_legacy o
+            WHERE {condition}
+            ON CONFLICT DO NOTHING
+            """
+        ),
+        params,
+    )
+    bind.execute(
+        sa.text(
+            f"""
+            INSERT INTO order_items (id, order_id, order_created_at, product_id,
+                                     product_name, product_price, quantity, subtotal)
+            SELECT oi.id, oi.order_id, o.created_at, oi.product_id,
+                   oi.product_name, oi.product_price, oi.quantity, oi.subtotal
+            FROM order_items_legacy oi
+            JOIN orders_legacy o ON o.id = oi.order_id
+            WHERE {condition}
+            ON CONFLICT DO NOTHING
+            """
+        ),
+        params,
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    resuming = bind.execute(sa.text("SELECT to_regclass('orders_legacy') IS NOT NULL")).scalar()
+
+    # A rerun after the copy below failed part way picks up from there
+    if not resuming:
+        # 1. Move the unpartitioned tables out of the way
+        op.rename_table('order_items', 'order_items_legacy')
+        op.rename_table('orders', 'orders_legacy')
+        op.execute('ALTER TABLE orders_legacy RENAME CONSTRAINT orders_pkey TO orders_legacy_pkey')
+        op.execute('ALTER TABLE order_items_legacy RENAME CONSTRAINT order_items_pkey TO order_items_legacy_pkey')
+        op.execute('ALTER INDEX ix_orders_user_id RENAME TO ix_orders_legacy_user_id')
+
+        # created_at becomes part of the primary key, so it can no longer be NULL
+        op.execute('UPDATE orders_legacy SET created_at = now() WHERE created_at IS NULL')
+
+        # 2. Partitioned parents, then one partition per month of existing history
+        create_partitioned_tables()
+
+    oldest = bind.execute(sa.text('SELECT min(created_at) FROM orders_legacy')).scalar()
+    current = month_start(datetime.utcnow())
+    first_month = month_start(oldest) if oldest else current
+
+    for statement in partition_statements(first_month, add_months(current, PARTITIONS_AHEAD)):
+        op.execute(statement)
+
+    # 3. Copy history one month per statement, each committed on its own, so
+    # no single transaction holds locks or WAL for the whole table. The
+    # tables above are committed first: new orders go to the partitioned
+    # tables while older ones are still being copied, and don't show up
+    # until their month is done.
+    with op.get_context().autocommit_block():
+        month = first_month
+        while month <= current:
+            copy_window(bind, month, add_months(month, 1))
+            month = add_months(month, 1)
+
+        # Anything dated in the future lands in the default partitions
+        copy_window(bind, add_months(current, 1), None)
+
+    op.drop_table('order_items_legacy')
+    op.drop_table('orders_legacy')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.rename_table('order_items', 'order_items_partitioned')
+    op.rename_table('orders', 'orders_partitioned')
+    op.execute('ALTER TABLE orders_partitioned RENAME CONSTRAINT orders_pkey TO orders_partitioned_pkey')
+    op.execute('ALTER TABLE order_items_partitioned RENAME CONSTRAINT order_items_pkey TO order_items_partitioned_pkey')
+    op.execute('ALTER INDEX ix_orders_user_id RENAME TO ix_orders_partitioned_user_id')
+    op.execute('ALTER INDEX ix_order_items_order_id RENAME TO ix_order_items_partitioned_order_id')
+
+    op.create_table(
+        'orders',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('total_amount', sa.Float(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('status', sa.String(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_orders_user_id'), 'orders', ['user_id'], unique=False)
+    op.create_table(
+        'order_items',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('order_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('product_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('product_name', sa.String(), nullable=True),
+        sa.Column('product_price', sa.Float(), nullable=True),
+        sa.Column('quantity', sa.Integer(), nullable=True),
+        sa.Column('subtotal', sa.Float(), nullable=True),
+        sa.ForeignKeyConstraint(['order_id'], ['orders.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+
+    op.execute('INSERT INTO orders SELECT id, user_id, total_amount, created_at, status FROM orders_partitioned')
+    op.execute(
+        'INSERT INTO order_items SELECT id, order_id, product_id, product_name, product_price, quantity, subtotal '
+        'FROM order_items_partitioned'
+    )
+
+    # Dropping a partitioned parent drops its partitions too
+    op.drop_table('order_items_partitioned')
+    op.drop_table('orders_partitioned')
@@ -0,0 +1,37 @@
+"""add_product_cooccurrence
+
+Revision ID: e2a84c5f1b67
+Revises: d7f3b8a1c926
+Create Date: 2026-10-19 16:02:44.931572
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2a84c5f1b67'
+down_revision: Union[str, Sequence[str], None] = 'd7f3b8a1c926'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Starts empty; fill it with `python -m backend.scripts.build_cooccurrence`
+    op.create_table(
+        'product_cooccurrence',
+        sa.Column('product_id', sa.Uuid(), nullable=False),
+        sa.Column('related_product_id', sa.Uuid(), nullable=False),
+        sa.Column('score', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('product_id', 'related_product_id'),
+    )
+    op.create_index('ix_product_cooccurrence_product_id_score', 'product_cooccurrence', ['product_id', 'score'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_product_cooccurrence_product_id_score', table_name='product_cooccurrence')
+    op.drop_table('product_cooccurrence')
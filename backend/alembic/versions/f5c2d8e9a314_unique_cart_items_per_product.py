@@ -0,0 +1,45 @@
+"""unique_cart_items_per_product
+
+Revision ID: f5c2d8e9a314
+Revises: e2a84c5f1b67
+Create Date: 2026-10-19 17:21:08.402117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f5c2d8e9a314'
+down_revision: Union[str, Sequence[str], None] = 'e2a84c5f1b67'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+RANKED = """
+    SELECT id,
+           SUM(quantity) OVER (PARTITION BY cart_id, product_id) AS total,
+           ROW_NUMBER() OVER (PARTITION BY cart_id, product_id ORDER BY id) AS rn
+    FROM cart_items
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Fold any duplicate (cart, product) rows into the first one before
+    # adding the constraint, so no quantities are lost
+    op.execute(
+        f"""
+        UPDATE cart_items SET quantity = ranked.total
+        FROM ({RANKED}) AS ranked
+        WHERE cart_items.id = ranked.id AND ranked.rn = 1 AND cart_items.quantity <> ranked.total
+        """
+    )
+    op.execute(f"DELETE FROM cart_items WHERE id IN (SELECT id FROM ({RANKED}) AS ranked WHERE rn > 1)")
+    op.create_unique_constraint('uq_cart_items_cart_id_product_id', 'cart_items', ['cart_id', 'product_id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('uq_cart_items_cart_id_product_id', 'cart_items', type_='unique')
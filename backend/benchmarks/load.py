@@ -0,0 +1,178 @@
+"""
+Asyncio HTTP load driver replaying a browse/cart/checkout/history mix.
+
+    # in-process against backend.main:app (no server needed)
+    python -m backend.benchmarks.load --duration 30 --concurrency 50
+
+    # against a running server
+    python -m backend.benchmarks.load --base-url http://localhost:8000 --duration 60
+
+The database must already be seeded with backend.benchmarks.seed (use
+--seed-scale to seed first when running in-process, e.g. on SQLite).
+Prints throughput and p50/p95/p99 latency per route.
+"""
+import argparse
+import asyncio
+import random
+import time
+from collections import defaultdict
+
+import httpx
+
+from backend.benchmarks.seed import BENCH_PASSWORD, DEFAULTS, user_email
+
+# (route label, weight): roughly what a storefront sees
+TRAFFIC_MIX = [
+    ("GET /products/", 30),
+    ("GET /products/{id}", 20),
+    ("GET /products/facets", 5),
+    ("POST /products/batch", 5),
+    ("GET /categories/", 5),
+    ("POST /cart/add/{id}", 12),
+    ("GET /cart/", 10),
+    ("POST /orders/checkout", 3),
+    ("GET /orders/my", 7),
+    ("GET /me", 3),
+]
+
+
+class Stats:
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+
+    def record(self, route, seconds, ok):
+        self.latencies[route].append(seconds)
+        if not ok:
+            self.errors[route] += 1
+
+    def report(self, elapsed):
+        total = sum(len(v) for v in self.latencies.values())
+        print(f"\n{total} requests in {elapsed:.1f}s = {total / elapsed:.1f} req/s\n")
+        print(f"{'route':<26}{'count':>8}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'errors':>8}")
+        for route, _ in TRAFFIC_MIX:
+            samples = sorted(self.latencies.get(route, []))
+            if not samples:
+                continue
+            print(
+                f"{route:<26}{len(samples):>8}{len(samples) / elapsed:>9.1f}"
+                f"{percentile(samples, 50) * 1000:>9.1f}{percentile(samples, 95) * 1000:>9.1f}"
+                f"{percentile(samples, 99) * 1000:>9.1f}{self.errors.get(route, 0):>8}"
+            )
+
+
+def percentile(sorted_samples, pct):
+    index = min(int(round(pct / 100 * (len(sorted_samples) - 1))), len(sorted_samples) - 1)
+    return sorted_samples[index]
+
+
+async def login(client, email):
+    response = await client.post("/login", data={"username": email, "password": BENCH_PASSWORD})
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+async def send(client, stats, route, method, url, **kwargs):
+    started = time.perf_counter()
+    try:
+        response = await client.request(method, url, **kwargs)
+        ok = response.status_code < 400 or response.status_code == 404
+    except httpx.HTTPError:
+        response, ok = None, False
+    stats.record(route, time.perf_counter() - started, ok)
+    return response
+
+
+async def virtual_user(client, stats, rng, auth, product_ids, deadline):
+    routes = [route for route, _ in TRAFFIC_MIX]
+    weights = [weight for _, weight in TRAFFIC_MIX]
+
+    while time.perf_counter() < deadline:
+        route = rng.choices(routes, weights)[0]
+        product_id = rng.choice(product_ids)
+
+        if route == "GET /products/":
+            params = {"skip": rng.randint(0, 200), "limit": 20, "sort": rng.choice(["newest", "price_asc", "name"])}
+            if rng.random() < 0.5:
+                params["fields"] = "id,name,price"
+            await send(client, stats, route, "GET", "/products/", params=params)
+        elif route == "GET /products/{id}":
+            await send(client, stats, route, "GET", f"/products/{product_id}")
+        elif route == "GET /products/facets":
+            await send(client, stats, route, "GET", "/products/facets")
+        elif route == "POST /products/batch":
+            ids = [str(i) for i in rng.sample(product_ids, min(30, len(product_ids)))]
+            await send(client, stats, route, "POST", "/products/batch", json={"ids": ids})
+        elif route == "GET /categories/":
+            await send(client, stats, route, "GET", "/categories/", params={"with_counts": "true"})
+        elif route == "POST /cart/add/{id}":
+            await send(client, stats, route, "POST", f"/cart/add/{product_id}", headers=auth)
+        elif route == "GET /cart/":
+            await send(client, stats, route, "GET", "/cart/", headers=auth)
+        elif route == "POST /orders/checkout":
+            await send(client, stats, route, "POST", "/orders/checkout", headers=auth)
+        elif route == "GET /orders/my":
+            await send(client, stats, route, "GET", "/orders/my", headers=auth)
+        elif route == "GET /me":
+            await send(client, stats, route, "GET", "/me", headers=auth)
+
+
+async def run(base_url, concurrency, duration, users, seed_value):
+    if base_url:
+        client = httpx.AsyncClient(base_url=base_url, timeout=30)
+    else:
+        from backend.main import app
+
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=30)
+
+    rng = random.Random(seed_value)
+    stats = Stats()
+
+    async with client:
+        response = await client.get("/products/", params={"fields": "id", "limit": 100})
+        response.raise_for_status()
+        product_ids = [p["id"] for p in response.json()]
+        if not product_ids:
+            raise SystemExit("No products found; run backend.benchmarks.seed first")
+
+        # Logins happen before the clock starts (bcrypt would dominate otherwise)
+        emails = [user_email(rng.randrange(users)) for _ in range(concurrency)]
+        auths = await asyncio.gather(*(login(client, email) for email in emails))
+
+        started = time.perf_counter()
+        deadline = started + duration
+        await asyncio.gather(*(
+            virtual_user(client, stats, random.Random(seed_value + n), auths[n], product_ids, deadline)
+            for n in range(concurrency)
+        ))
+        stats.report(time.perf_counter() - started)
+
+
+async def main(args):
+    if not args.base_url:
+        from backend.main import init_db
+
+        await init_db()
+        if args.seed_scale:
+            from backend.benchmarks.seed import seed
+
+            await seed(
+                users=DEFAULTS["users"] * args.seed_scale,
+                categories=DEFAULTS["categories"],
+                products=DEFAULTS["products"] * args.seed_scale,
+                carts=DEFAULTS["carts"] * args.seed_scale,
+                orders=DEFAULTS["orders"] * args.seed_scale,
+            )
+
+    await run(args.base_url, args.concurrency, args.duration, args.users, args.seed)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--base-url", default=None, help="target server; omit to run in-process")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=30, help="seconds")
+    parser.add_argument("--users", type=int, default=DEFAULTS["users"], help="seeded users to log in as")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--seed-scale", type=int, default=0, help="seed the database first (in-process only)")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,77 @@
+"""
+Micro-benchmarks for response serialisation and the auth token paths.
+
+    python -m backend.benchmarks.micro
+    python -m backend.benchmarks.micro --number 5000 --cart-items 20
+
+No database is needed: ORM objects are built in memory.
+"""
+import argparse
+import timeit
+import uuid
+from datetime import datetime
+
+from backend.core.auth import create_access_token, decode_access_token, hash_password, verify_password
+from backend.models import Cart, CartItem, Category, Product
+from backend.schemas.cart import CartResponse
+from backend.schemas.product import ProductPartialResponse, ProductResponse
+
+
+def make_product(category):
+    return Product(
+        id=uuid.uuid4(),
+        name="Elite Running Shoes",
+        description="Lightweight trainer with a carbon plate " * 4,
+        price=129.99,
+        is_active=True,
+        category_id=category.id,
+        category=category,
+    )
+
+
+def make_cart(items: int):
+    category = Category(id=1, name="Footwear", created_at=datetime.utcnow())
+    cart = Cart(id=uuid.uuid4(), user_id=uuid.uuid4())
+    for _ in range(items):
+        product = make_product(category)
+        cart.items.append(CartItem(id=uuid.uuid4(), product_id=product.id, product=product, quantity=2))
+    return cart
+
+
+def bench(label, fn, number, repeat=5):
+    best = min(timeit.repeat(fn, number=number, repeat=repeat)) / number
+    print(f"{label:<44}{best * 1e6:>12.1f} us/op{1 / best:>14.0f} ops/s")
+
+
+def main(number: int, cart_items: int, bcrypt_rounds: int):
+    category = Category(id=1, name="Footwear", created_at=datetime.utcnow())
+    product = make_product(category)
+    products = [make_product(category) for _ in range(20)]
+    cart = make_cart(cart_items)
+
+    token = create_access_token({"user_id": str(uuid.uuid4())})
+    hashed = hash_password("benchpass123")
+
+    print(f"{'benchmark':<44}{'time':>18}{'throughput':>14}")
+    bench("ProductResponse (1 product)", lambda: ProductResponse.model_validate(product).model_dump_json(), number)
+    bench("ProductResponse (20 products)",
+          lambda: [ProductResponse.model_validate(p).model_dump_json() for p in products], number // 20 or 1)
+    bench("ProductPartialResponse id,name,price",
+          lambda: ProductPartialResponse.model_validate(
+              {"id": product.id, "name": product.name, "price": product.price}
+          ).model_dump_json(exclude_unset=True), number)
+    bench(f"CartResponse ({cart_items} items)",
+          lambda: CartResponse.model_validate(cart).model_dump_json(), number // cart_items or 1)
+    bench("create_access_token", lambda: create_access_token({"user_id": "bench"}), number)
+    bench("decode_access_token", lambda: decode_access_token(token), number)
+    # bcrypt is intentionally slow, so only a handful of rounds
+    bench("verify_password (bcrypt)", lambda: verify_password("benchpass123", hashed), bcrypt_rounds, repeat=1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--number", type=int, default=2000, help="iterations per benchmark")
+    parser.add_argument("--cart-items", type=int, default=10)
+    parser.add_argument("--bcrypt-rounds", type=int, default=5)
+    args = parser.parse_args()
+    main(args.number, args.cart_items, args.bcrypt_rounds)
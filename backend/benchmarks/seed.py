@@ -0,0 +1,203 @@
+"""
+Bulk-seed users, categories, products, carts and orders for benchmarking.
+
+    python -m backend.benchmarks.seed --scale 1
+    python -m backend.benchmarks.seed --users 5000 --products 50000 --orders 200000
+
+Every seeded user is bench-user-<n>@example.com with password BENCH_PASSWORD,
+so the load driver can log in as any of them. The same --seed always
+produces the same data.
+"""
+import argparse
+import asyncio
+import random
+import uuid
+from datetime import datetime, timedelta
+from sqlalchemy import insert, text
+
+from backend.core.auth import hash_password
+from backend.crud.analytics import rebuild_rollups
+from backend.db.dialect import is_postgres
+from backend.db.partitions import month_start, partition_statements
+from backend.db.session import SessionLocal, engine
+from backend.models import (
+    Cart,
+    CartItem,
+    Category,
+    CategoryProductCount,
+    Order,
+    OrderItem,
+    Product,
+    User,
+)
+
+BENCH_PASSWORD = "benchpass123"
+CHUNK_SIZE = 1000
+
+# Rows per unit of --scale
+DEFAULTS = {
+    "users": 1000,
+    "categories": 20,
+    "products": 5000,
+    "carts": 500,
+    "orders": 10000,
+}
+
+ADJECTIVES = ["Pro", "Elite", "Classic", "Ultra", "Junior", "Training", "Match", "Street", "Trail", "Indoor"]
+NOUNS = ["Football", "Running Shoes", "Tennis Racket", "Goalkeeper Gloves", "Jersey", "Shin Guards",
+         "Basketball", "Yoga Mat", "Water Bottle", "Cricket Bat", "Swim Goggles", "Cycling Helmet"]
+
+
+def user_email(n: int) -> str:
+    return f"bench-user-{n}@example.com"
+
+
+async def bulk_insert(db, model, rows):
+    for start in range(0, len(rows), CHUNK_SIZE):
+        await db.execute(insert(model), rows[start:start + CHUNK_SIZE])
+
+
+async def seed(users, categories, products, carts, orders, history_days=365, seed_value=42, log=print):
+    rng = random.Random(seed_value)
+    now = datetime.utcnow()
+
+    async with engine.begin() as conn:
+        # Orders go back history_days, so make sure every month has a partition
+        if is_postgres(conn):
+            for statement in partition_statements(month_start(now - timedelta(days=history_days)), month_start(now)):
+                await conn.execute(text(statement))
+
+    async with SessionLocal() as db:
+        # bcrypt is deliberately slow: hash once and share it
+        hashed = hash_password(BENCH_PASSWORD)
+        user_rows = [
+            {"id": uuid.UUID(int=rng.getrandbits(128)), "email": user_email(n), "hashed_password": hashed, "is_admin": n == 0}
+            for n in range(users)
+        ]
+        await bulk_insert(db, User, user_rows)
+        log(f"users: {users}")
+
+        category_rows = [{"id": n + 1, "name": f"Bench Category {n + 1}"} for n in range(categories)]
+        await bulk_insert(db, Category, category_rows)
+        if is_postgres(db) and category_rows:
+            # Explicit ids don't advance the serial; keep create_category working
+            await db.execute(text("SELECT setval(pg_get_serial_sequence('categories', 'id'), :max_id)"),
+                             {"max_id": categories})
+
+        product_rows = []
+        active_counts = {row["id"]: 0 for row in category_rows}
+        for n in range(products):
+            category_id = rng.randint(1, categories) if categories else None
+            is_active = rng.random() > 0.05
+            if is_active and category_id:
+                active_counts[category_id] += 1
+            product_rows.append({
+                "id": uuid.UUID(int=rng.getrandbits(128)),
+                "name": f"{rng.choice(ADJECTIVES)} {rng.choice(NOUNS)} {n}",
+                "description": "Seeded benchmark product " * rng.randint(1, 8),
+                "price": round(rng.uniform(5, 400), 2),
+                "is_active": is_active,
+                "category_id": category_id,
+                "created_at": now - timedelta(minutes=rng.randint(0, history_days * 24 * 60)),
+            })
+        await bulk_insert(db, Product, product_rows)
+        await bulk_insert(
+            db,
+            CategoryProductCount,
+            [{"category_id": cid, "active_count": count} for cid, count in active_counts.items()],
+        )
+        log(f"categories: {categories}, products: {products}")
+
+        active_products = [p for p in product_rows if p["is_active"]]
+
+        cart_rows, cart_item_rows = [], []
+        for user in rng.sample(user_rows, min(carts, users)):
+            cart_id = uuid.UUID(int=rng.getrandbits(128))
+            # Spread over ~2 months so the abandoned-cart sweeper has work to do
+            cart_rows.append({
+                "id": cart_id,
+                "user_id": user["id"],
+                "last_active_at": now - timedelta(minutes=rng.randint(0, 60 * 24 * 60)),
+            })
+            for product in rng.sample(active_products, min(rng.randint(1, 5), len(active_products))):
+                cart_item_rows.append({
+                    "id": uuid.UUID(int=rng.getrandbits(128)),
+                    "cart_id": cart_id,
+                    "product_id": product["id"],
+                    "quantity": rng.randint(1, 3),
+                })
+        await bulk_insert(db, Cart, cart_rows)
+        await bulk_insert(db, CartItem, cart_item_rows)
+        log(f"carts: {len(cart_rows)}, cart items: {len(cart_item_rows)}")
+
+        order_rows, order_item_rows = [], []
+        for _ in range(orders):
+            order_id = uuid.UUID(int=rng.getrandbits(128))
+            created_at = now - timedelta(seconds=rng.randint(0, history_days * 86400))
+            total = 0
+            for product in rng.sample(active_products, min(rng.randint(1, 5), len(active_products))):
+                quantity = rng.randint(1, 3)
+                subtotal = product["price"] * quantity
+                total += subtotal
+                order_item_rows.append({
+                    "id": uuid.UUID(int=rng.getrandbits(128)),
+                    "order_id": order_id,
+                    "order_created_at": created_at,
+                    "product_id": product["id"],
+                    "product_name": product["name"],
+                    "product_price": product["price"],
+                    "quantity": quantity,
+                    "subtotal": subtotal,
+                })
+            order_rows.append({
+                "id": order_id,
+                "user_id": rng.choice(user_rows)["id"],
+                "total_amount": total,
+                "created_at": created_at,
+                "status": "paid",
+            })
+        await bulk_insert(db, Order, order_rows)
+        await bulk_insert(db, OrderItem, order_item_rows)
+        await db.commit()
+        log(f"orders: {len(order_rows)}, order items: {len(order_item_rows)}")
+
+        await rebuild_rollups(db, batch_days=30, log=lambda message: None)
+        log("analytics rollups rebuilt")
+
+
+def row_count(args, name: str, scaled: bool = True):
+    # An explicit --<name> wins, including 0; otherwise the (scaled) default
+    value = getattr(args, name)
+    if value is not None:
+        return value
+    return DEFAULTS[name] * (args.scale if scaled else 1)
+
+
+async def main(args):
+    from backend.main import init_db
+
+    await init_db()
+    await seed(
+        users=row_count(args, "users"),
+        categories=row_count(args, "categories", scaled=False),
+        products=row_count(args, "products"),
+        carts=row_count(args, "carts"),
+        orders=row_count(args, "orders"),
+        history_days=args.history_days,
+        seed_value=args.seed,
+    )
+    await engine.dispose()
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scale", type=int, default=1, help="multiplier for the default row counts")
+    for name in DEFAULTS:
+        parser.add_argument(f"--{name}", type=int, default=None)
+    parser.add_argument("--history-days", type=int, default=365)
+    parser.add_argument("--seed", type=int, default=42)
+    return parser
+
+
+if __name__ == "__main__":
+    asyncio.run(main(build_parser().parse_args()))
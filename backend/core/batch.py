@@ -0,0 +1,141 @@
+import asyncio
+import json
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+# Sub-requests of POST /batch carry the already-authenticated user under
+# this scope key; get_current_user returns it instead of hitting the DB again
+BATCH_USER_SCOPE_KEY = "batch.user"
+
+BATCH_MAX_REQUESTS = int(os.getenv("BATCH_MAX_REQUESTS", "20"))
+# Concurrent GETs per batch; each one may hold a pooled DB connection
+BATCH_MAX_CONCURRENCY = int(os.getenv("BATCH_MAX_CONCURRENCY", "5"))
+
+# Handled once by the outer request: compression applies to the whole
+# batch response, and an Idempotency-Key covers the batch as a unit
+STRIPPED_HEADERS = {
+    b"accept-encoding",
+    b"content-length",
+    b"content-type",
+    b"idempotency-key",
+    b"x-profile",
+}
+
+
+def build_scope(parent: dict, operation, user) -> dict:
+    path, _, query = operation.path.partition("?")
+    # Per-operation headers override the batch request's own
+    overrides = {
+        name.lower().encode("latin-1"): value.encode("latin-1")
+        for name, value in (operation.headers or {}).items()
+    }
+    headers = [
+        (k, v) for k, v in parent["headers"] if k not in STRIPPED_HEADERS and k not in overrides
+    ]
+    headers.extend((k, v) for k, v in overrides.items() if k not in STRIPPED_HEADERS)
+    if operation.body is not None:
+        headers.append((b"content-type", b"application/json"))
+
+    scope = {
+        "type": "http",
+        "asgi": parent.get("asgi", {"version": "3.0"}),
+        "http_version": parent.get("http_version", "1.1"),
+        "method": operation.method,
+        "scheme": parent.get("scheme", "http"),
+        "server": parent.get("server"),
+        "client": parent.get("client"),
+        "root_path": parent.get("root_path", ""),
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query.encode(),
+        "headers": headers,
+        "state": dict(parent.get("state", {})),
+    }
+    # An operation with its own Authorization header authenticates itself
+    if user is not None and b"authorization" not in overrides:
+        scope[BATCH_USER_SCOPE_KEY] = user
+    return scope
+
+
+async def call_app(app, scope: dict, body: bytes):
+    """Run one sub-request through the full ASGI app and buffer its response."""
+    response = {"status": 500, "headers": [], "body": b""}
+    request_sent = False
+
+    async def receive():
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        # Nothing more is coming; park like a quiet client would
+        await asyncio.Event().wait()
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            response["status"] = message["status"]
+            response["headers"] = message.get("headers", [])
+        elif message["type"] == "http.response.body":
+            response["body"] += message.get("body", b"")
+
+    try:
+        await app(scope, receive, send)
+    except Exception:
+        # ServerErrorMiddleware re-raises after sending its 500; keep that
+        # (or the default 500) so one failure doesn't sink the whole batch
+        logger.exception("Batch sub-request %s %s failed", scope["method"], scope["path"])
+    return response
+
+
+def decode_result(response: dict) -> dict:
+    headers = {}
+    set_cookies = []
+    for name, value in response["headers"]:
+        name, value = name.decode("latin-1"), value.decode("latin-1")
+        if name == "set-cookie":
+            set_cookies.append(value)
+        elif name != "content-length":
+            headers[name] = value
+
+    body = response["body"]
+    if headers.get("content-type", "").startswith("application/json") and body:
+        body = json.loads(body)
+    else:
+        body = body.decode("utf-8", errors="replace") or None
+
+    return {"status": response["status"], "headers": headers, "body": body}, set_cookies
+
+
+async def run_batch(app, parent_scope: dict, operations, user):
+    """
+    Execute sub-requests in order. Consecutive GETs run concurrently (up to
+    BATCH_MAX_CONCURRENCY at a time); any other method waits for everything
+    before it and runs alone, so reads after a write see that write.
+    Returns (results in request order, Set-Cookie values to pass on).
+    """
+    semaphore = asyncio.Semaphore(BATCH_MAX_CONCURRENCY)
+
+    async def run(operation):
+        scope = build_scope(parent_scope, operation, user)
+        body = json.dumps(operation.body).encode() if operation.body is not None else b""
+        async with semaphore:
+            return await call_app(app, scope, body)
+
+    responses = []
+    reads = []
+    for operation in operations:
+        if operation.method == "GET":
+            reads.append(run(operation))
+            continue
+        responses.extend(await asyncio.gather(*reads))
+        reads = []
+        responses.append(await run(operation))
+    responses.extend(await asyncio.gather(*reads))
+
+    results, set_cookies = [], []
+    for response in responses:
+        result, cookies = decode_result(response)
+        results.append(result)
+        set_cookies.extend(cookies)
+    return results, set_cookies
@@ -0,0 +1,116 @@
+import gzip
+import os
+from starlette.datastructures import Headers, MutableHeaders
+
+# brotli is optional: without it we only negotiate gzip
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+GZIP_LEVEL = int(os.getenv("GZIP_LEVEL", "6"))
+BROTLI_QUALITY = int(os.getenv("BROTLI_QUALITY", "4"))
+
+COMPRESSIBLE_TYPES = ("text/", "application/json", "application/javascript", "application/xml")
+
+
+def choose_encoding(accept_encoding: str):
+    # Parse "br;q=1.0, gzip;q=0.8" into {"br": 1.0, "gzip": 0.8}
+    weights = {}
+    for part in accept_encoding.split(","):
+        token, _, params = part.strip().partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[token] = q
+
+    candidates = ["gzip"]
+    if brotli is not None:
+        candidates.insert(0, "br")
+
+    best = None
+    for encoding in candidates:
+        q = weights.get(encoding, weights.get("*", 0.0))
+        if q > 0 and (best is None or q > best[1]):
+            best = (encoding, q)
+
+    return best[0] if best else None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL)
+
+
+class CompressionMiddleware:
+    """
+    Compresses buffered responses with brotli or gzip, depending on what the
+    client accepts. Bodies smaller than minimum_size are sent as-is, and
+    streaming responses are passed through untouched.
+    """
+
+    def __init__(self, app, minimum_size: int = COMPRESSION_MIN_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        body_parts = []
+        streaming = False
+
+        async def send_wrapper(message):
+            nonlocal start_message, streaming
+
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+
+            if message["type"] != "http.response.body" or streaming:
+                await send(message)
+                return
+
+            body_parts.append(message.get("body", b""))
+
+            if message.get("more_body", False):
+                # Streaming response: flush what we have and stop buffering
+                streaming = True
+                await send(start_message)
+                await send({"type": "http.response.body", "body": b"".join(body_parts), "more_body": True})
+                return
+
+            body = b"".join(body_parts)
+            headers = MutableHeaders(raw=start_message["headers"])
+            headers.add_vary_header("Accept-Encoding")
+
+            content_type = headers.get("content-type", "")
+            if (
+                len(body) >= self.minimum_size
+                and "content-encoding" not in headers
+                and content_type.startswith(COMPRESSIBLE_TYPES)
+            ):
+                body = compress(body, encoding)
+                headers["Content-Encoding"] = encoding
+                headers["Content-Length"] = str(len(body))
+
+            await send(start_message)
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_wrapper)
@@ -1,6 +1,8 @@
-from fastapi import Depends, HTTPException
+import uuid
+from fastapi import Depends, HTTPException, Request
 from fastapi.security import OAuth2PasswordBearer
 from backend.core.auth import decode_access_token
+from backend.core.batch import BATCH_USER_SCOPE_KEY
 from backend.db.session import SessionLocal
 from backend.models.user import User
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -18,15 +20,24 @@ async def get_db():
 
 
 async def get_current_user(
+    request: Request,
     token: str = Depends(oauth2_scheme), 
     db: AsyncSession = Depends(get_db)  # Use AsyncSession
 ):
+    # Inside POST /batch the user was already loaded once for all sub-requests
+    batch_user = request.scope.get(BATCH_USER_SCOPE_KEY)
+    if batch_user is not None:
+        return batch_user
+
     payload = decode_access_token(token)
     if payload is None:
         raise HTTPException(status_code=401, detail="Invalid token")
 
-    user_id = payload.get("user_id")
-    
+    try:
+        user_id = uuid.UUID(payload.get("user_id"))
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=401, detail="Invalid token")
+
     # Use select() instead of query()
     result = await db.execute(select(User).where(User.id == user_id))
     user = result.scalars().first()
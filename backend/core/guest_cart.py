@@ -0,0 +1,78 @@
+import base64
+import hashlib
+import hmac
+import uuid
+
+from backend.core.auth import SECRET_KEY
+
+# Anonymous carts live entirely in a signed cookie, so browsing and adding to
+# a guest cart never writes to the database. Each line is 17 bytes (16-byte
+# product id + 1-byte quantity) before base64, which keeps a full cart well
+# under the 4 KB cookie limit.
+COOKIE_NAME = "guest_cart"
+COOKIE_MAX_AGE = 60 * 60 * 24 * 30
+MAX_ITEMS = 50
+MAX_QUANTITY = 255
+
+_KEY = hashlib.sha256(f"guest-cart:{SECRET_KEY}".encode()).digest()
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def _sign(payload: bytes) -> bytes:
+    return hmac.new(_KEY, payload, hashlib.sha256).digest()[:16]
+
+
+def encode_guest_cart(items: dict) -> str:
+    payload = b"".join(
+        product_id.bytes + bytes([min(quantity, MAX_QUANTITY)])
+        for product_id, quantity in list(items.items())[:MAX_ITEMS]
+    )
+    return f"{_b64encode(payload)}.{_b64encode(_sign(payload))}"
+
+
+def decode_guest_cart(value) -> dict:
+    # Missing, malformed or tampered cookies all read as an empty cart
+    if not value:
+        return {}
+    try:
+        payload_part, signature_part = value.split(".", 1)
+        payload = _b64decode(payload_part)
+        if not hmac.compare_digest(_b64decode(signature_part), _sign(payload)):
+            return {}
+    except ValueError:
+        return {}
+
+    if len(payload) % 17:
+        return {}
+
+    items = {}
+    for offset in range(0, len(payload), 17):
+        quantity = payload[offset + 16]
+        if quantity:
+            items[uuid.UUID(bytes=payload[offset:offset + 16])] = quantity
+    return items
+
+
+def read_guest_cart(request) -> dict:
+    return decode_guest_cart(request.cookies.get(COOKIE_NAME))
+
+
+def write_guest_cart(response, items: dict):
+    response.set_cookie(
+        COOKIE_NAME,
+        encode_guest_cart(items),
+        max_age=COOKIE_MAX_AGE,
+        httponly=True,
+        samesite="lax",
+    )
+
+
+def clear_guest_cart(response):
+    response.delete_cookie(COOKIE_NAME, httponly=True, samesite="lax")
@@ -0,0 +1,261 @@
+import asyncio
+import base64
+import hashlib
+import json
+import os
+import uuid
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+
+from backend.core.auth import decode_access_token
+from backend.core.cache import TTLCache
+
+IDEMPOTENCY_BACKEND = os.getenv("IDEMPOTENCY_BACKEND", "memory")  # "memory" or "redis"
+IDEMPOTENCY_TTL_SECONDS = int(os.getenv("IDEMPOTENCY_TTL_SECONDS", "86400"))
+IDEMPOTENCY_MAX_KEYS = int(os.getenv("IDEMPOTENCY_MAX_KEYS", "10000"))
+IDEMPOTENCY_WAIT_SECONDS = float(os.getenv("IDEMPOTENCY_WAIT_SECONDS", "30"))
+# The in-flight lock is refreshed while the handler runs, so this only bounds
+# how long a crashed worker can wedge a key, not how long a handler may take
+IDEMPOTENCY_LOCK_TTL_SECONDS = int(os.getenv("IDEMPOTENCY_LOCK_TTL_SECONDS", "30"))
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379")
+
+MUTATING_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+HEADER = "idempotency-key"
+
+
+class MemoryIdempotencyStore:
+    """
+    Per-worker store. Concurrent duplicates inside the worker wait on an
+    asyncio.Event; use the redis backend when running several workers.
+    """
+
+    # In-process locks can't expire, so nothing needs refreshing
+    refresh_interval = None
+
+    def __init__(self, ttl: int = IDEMPOTENCY_TTL_SECONDS, maxsize: int = IDEMPOTENCY_MAX_KEYS):
+        self._records = TTLCache(ttl=ttl, maxsize=maxsize)
+        self._inflight = {}
+
+    async def get(self, key):
+        return self._records.get(key)
+
+    async def begin(self, key):
+        # True means the caller owns the key and must complete() or release() it
+        if key in self._inflight:
+            return False
+        self._inflight[key] = asyncio.Event()
+        return True
+
+    async def wait(self, key, timeout: float):
+        event = self._inflight.get(key)
+        if event is not None:
+            try:
+                await asyncio.wait_for(event.wait(), timeout)
+            except asyncio.TimeoutError:
+                return None
+        return self._records.get(key)
+
+    async def complete(self, key, record):
+        self._records.set(key, record)
+        self.release_nowait(key)
+
+    async def release(self, key):
+        self.release_nowait(key)
+
+    def release_nowait(self, key):
+        event = self._inflight.pop(key, None)
+        if event is not None:
+            event.set()
+
+
+class RedisIdempotencyStore:
+    """
+    Shared across workers. Records expire after the TTL; the in-flight lock
+    is refreshed while its handler runs and expires lock_ttl seconds after
+    that stops, so a crashed worker can't wedge a key.
+    """
+
+    def __init__(self, url: str = REDIS_URL, ttl: int = IDEMPOTENCY_TTL_SECONDS,
+                 lock_ttl: int = IDEMPOTENCY_LOCK_TTL_SECONDS):
+        # Optional dependency, only needed when IDEMPOTENCY_BACKEND=redis
+        import redis.asyncio as redis
+
+        self.redis = redis.from_url(url)
+        self.ttl = ttl
+        self.lock_ttl = lock_ttl
+        self.refresh_interval = lock_ttl / 3
+
+    async def get(self, key):
+        raw = await self.redis.get(f"idem:{key}")
+        return decode_record(raw) if raw else None
+
+    async def begin(self, key):
+        return bool(await self.redis.set(f"idem:lock:{key}", 1, nx=True, ex=self.lock_ttl))
+
+    async def wait(self, key, timeout: float):
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while loop.time() < deadline:
+            record = await self.get(key)
+            if record is not None:
+                return record
+            if not await self.redis.exists(f"idem:lock:{key}"):
+                return None
+            await asyncio.sleep(0.05)
+        return None
+
+    async def refresh(self, key):
+        await self.redis.expire(f"idem:lock:{key}", self.lock_ttl)
+
+    async def complete(self, key, record):
+        await self.redis.set(f"idem:{key}", encode_record(record), ex=self.ttl)
+        await self.release(key)
+
+    async def release(self, key):
+        await self.redis.delete(f"idem:lock:{key}")
+
+
+def encode_record(record):
+    return json.dumps({**record, "body": base64.b64encode(record["body"]).decode()})
+
+
+def decode_record(raw):
+    record = json.loads(raw)
+    record["body"] = base64.b64decode(record["body"])
+    return record
+
+
+def create_store():
+    if IDEMPOTENCY_BACKEND == "redis":
+        return RedisIdempotencyStore()
+    return MemoryIdempotencyStore()
+
+
+def request_user_id(headers: Headers):
+    # Decode the JWT only; the route still does the real auth check
+    scheme, _, token = headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    payload = decode_access_token(token)
+    try:
+        return uuid.UUID(payload["user_id"]) if payload else None
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+class IdempotencyMiddleware:
+    """
+    Replays the stored response for a repeated (user, Idempotency-Key) pair
+    on mutating requests instead of running the handler again.
+    """
+
+    def __init__(self, app, store=None, wait_timeout: float = IDEMPOTENCY_WAIT_SECONDS):
+        self.app = app
+        self.store = store or create_store()
+        self.wait_timeout = wait_timeout
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in MUTATING_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        idempotency_key = headers.get(HEADER)
+        user_id = request_user_id(headers) if idempotency_key else None
+        if not idempotency_key or user_id is None:
+            await self.app(scope, receive, send)
+            return
+
+        # Read the body up front: it is part of the fingerprint, and the app
+        # still needs to receive it afterwards
+        body = b""
+        more_body = True
+        while more_body:
+            message = await receive()
+            body += message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+        fingerprint = hashlib.sha256(
+            b"\n".join([scope["method"].encode(), scope["path"].encode(), scope.get("query_string", b""), body])
+        ).hexdigest()
+        key = f"{user_id}:{idempotency_key}"
+
+        record = await self.store.get(key)
+        if record is None and not await self.store.begin(key):
+            # Same key already executing: wait for its response
+            record = await self.store.wait(key, self.wait_timeout)
+            if record is None:
+                await JSONResponse(
+                    {"detail": "A request with this Idempotency-Key is still in progress"},
+                    status_code=409,
+                )(scope, receive, send)
+                return
+        elif record is None:
+            # The previous owner may have completed between our get() and
+            # begin(); its lock is gone but the record is there to replay
+            record = await self.store.get(key)
+            if record is not None:
+                await self.store.release(key)
+
+        if record is not None:
+            await self.replay(record, fingerprint, scope, receive, send)
+            return
+
+        await self.execute(key, fingerprint, body, scope, receive, send)
+
+    async def replay(self, record, fingerprint, scope, receive, send):
+        if record["fingerprint"] != fingerprint:
+            await JSONResponse(
+                {"detail": "Idempotency-Key was already used with a different request"},
+                status_code=422,
+            )(scope, receive, send)
+            return
+
+        headers = [(k.encode("latin-1"), v.encode("latin-1")) for k, v in record["headers"]]
+        headers.append((b"idempotent-replayed", b"true"))
+        await send({"type": "http.response.start", "status": record["status"], "headers": headers})
+        await send({"type": "http.response.body", "body": record["body"]})
+
+    async def execute(self, key, fingerprint, body, scope, receive, send):
+        body_sent = False
+        response = {"status": 500, "headers": [], "body": b""}
+
+        async def replay_receive():
+            nonlocal body_sent
+            if not body_sent:
+                body_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            # Body already consumed; this now only waits for the disconnect
+            return await receive()
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+                response["headers"] = [
+                    (k.decode("latin-1"), v.decode("latin-1")) for k, v in message.get("headers", [])
+                ]
+            elif message["type"] == "http.response.body":
+                response["body"] += message.get("body", b"")
+            await send(message)
+
+        keepalive = asyncio.create_task(self.keep_locked(key)) if self.store.refresh_interval else None
+        try:
+            await self.app(scope, replay_receive, send_wrapper)
+        except BaseException:
+            await self.store.release(key)
+            raise
+        finally:
+            if keepalive is not None:
+                keepalive.cancel()
+
+        # Server errors are not stored so the client's retry can succeed
+        if response["status"] >= 500:
+            await self.store.release(key)
+        else:
+            await self.store.complete(key, {"fingerprint": fingerprint, **response})
+
+    async def keep_locked(self, key):
+        # Slow handlers keep their lock so a retry can't start a duplicate
+        while True:
+            await asyncio.sleep(self.store.refresh_interval)
+            await self.store.refresh(key)
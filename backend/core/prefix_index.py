@@ -0,0 +1,146 @@
+import heapq
+import re
+from bisect import bisect_left, insort
+from itertools import groupby
+
+WORD = re.compile(r"\w+")
+
+
+def normalize(value: str) -> str:
+    return " ".join(WORD.findall(value.lower()))
+
+
+class PrefixIndex:
+    """
+    In-memory typeahead index: a sorted list of (term, id) pairs where each
+    name contributes one term per word start ("elite running shoes",
+    "running shoes", "shoes"), so any word in a name can be completed.
+
+    Prefixes up to `short_prefix` characters match a large share of the
+    catalogue, so their `top_k` best ids are precomputed and kept up to date.
+    Longer prefixes bisect both ends of their (narrow) range and rank every
+    match in it.
+    """
+
+    def __init__(self, short_prefix: int = 3, top_k: int = 20):
+        self.short_prefix = short_prefix
+        self.top_k = top_k
+        self._entries = []
+        self._items = {}  # id -> (name, weight, terms)
+        self._top = {}  # short prefix -> best ids, best first; missing = recompute
+
+    def __len__(self):
+        return len(self._items)
+
+    @staticmethod
+    def terms_for(name: str):
+        words = normalize(name).split()
+        return [" ".join(words[i:]) for i in range(len(words))]
+
+    def _rank_key(self, item_id):
+        # Most popular first, then alphabetical
+        name, weight, _ = self._items[item_id]
+        return -weight, name
+
+    def _short_prefixes(self, terms):
+        return {term[:n] for term in terms for n in range(1, self.short_prefix + 1)}
+
+    def _rank_range(self, prefix: str, limit: int):
+        # Every term starting with `prefix` sorts before prefix + U+10FFFF
+        start = bisect_left(self._entries, (prefix,))
+        end = bisect_left(self._entries, (prefix + "\U0010ffff",), start)
+        matches = {item_id for _, item_id in self._entries[start:end]}
+        return heapq.nsmallest(limit, matches, key=self._rank_key)
+
+    def _promote(self, item_id):
+        # The item was added or gained weight: it can only move up
+        for prefix in self._short_prefixes(self._items[item_id][2]):
+            top = self._top.get(prefix)
+            if top is None:
+                continue
+            if item_id not in top:
+                if len(top) >= self.top_k and self._rank_key(item_id) >= self._rank_key(top[-1]):
+                    continue
+                top.append(item_id)
+            top.sort(key=self._rank_key)
+            del top[self.top_k:]
+
+    def _evict(self, item_id, terms):
+        # A list that loses a member has to be recomputed to refill it
+        for prefix in self._short_prefixes(terms):
+            top = self._top.get(prefix)
+            if top is not None and item_id in top:
+                del self._top[prefix]
+
+    def add(self, item_id, name: str, weight: float = None):
+        # weight=None keeps the current weight (e.g. when a product is renamed)
+        if weight is None:
+            weight = self._items[item_id][1] if item_id in self._items else 0
+        self.remove(item_id)
+        terms = self.terms_for(name)
+        for term in terms:
+            insort(self._entries, (term, item_id))
+        self._items[item_id] = (name, weight, terms)
+        self._promote(item_id)
+
+    def remove(self, item_id):
+        item = self._items.get(item_id)
+        if item is None:
+            return
+        self._evict(item_id, item[2])
+        del self._items[item_id]
+        for term in item[2]:
+            index = bisect_left(self._entries, (term, item_id))
+            if index < len(self._entries) and self._entries[index] == (term, item_id):
+                del self._entries[index]
+
+    def bump(self, item_id, amount: float):
+        item = self._items.get(item_id)
+        if item is None:
+            return
+        if amount < 0:
+            self._evict(item_id, item[2])
+        self._items[item_id] = (item[0], item[1] + amount, item[2])
+        if amount > 0:
+            self._promote(item_id)
+
+    def replace(self, items):
+        # Bulk (re)build from (id, name, weight) tuples: one sort, not N inserts
+        entries, by_id = [], {}
+        for item_id, name, weight in items:
+            terms = self.terms_for(name)
+            entries.extend((term, item_id) for term in terms)
+            by_id[item_id] = (name, weight, terms)
+        entries.sort()
+        self._entries, self._items = entries, by_id
+
+        # The longest short prefixes are contiguous runs of the sorted entries;
+        # each shorter prefix's best are among the best of its extensions
+        top = {}
+        for prefix, run in groupby(entries, key=lambda entry: entry[0][:self.short_prefix]):
+            top[prefix] = heapq.nsmallest(self.top_k, {item_id for _, item_id in run}, key=self._rank_key)
+        level = top
+        for n in range(self.short_prefix - 1, 0, -1):
+            shorter = {}
+            for prefix, best in level.items():
+                shorter.setdefault(prefix[:n], set()).update(best)
+            level = {
+                prefix: heapq.nsmallest(self.top_k, ids, key=self._rank_key)
+                for prefix, ids in shorter.items()
+            }
+            top.update(level)
+        self._top = top
+
+    def search(self, prefix: str, limit: int = 10):
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+
+        if len(prefix) <= self.short_prefix and limit <= self.top_k:
+            best = self._top.get(prefix)
+            if best is None:
+                best = self._top[prefix] = self._rank_range(prefix, self.top_k)
+            best = best[:limit]
+        else:
+            best = self._rank_range(prefix, limit)
+        return [{"id": item_id, "name": self._items[item_id][0]} for item_id in best]
@@ -0,0 +1,155 @@
+import asyncio
+import contextvars
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from sqlalchemy import event, select
+from starlette.datastructures import Headers, MutableHeaders
+
+from backend.core.idempotency import request_user_id
+from backend.db.session import SessionLocal, engine
+from backend.models.user import User
+
+PROFILE_DIR = os.getenv("PROFILE_DIR", "profiles")
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_INTERVAL_SECONDS = float(os.getenv("PROFILE_INTERVAL_MS", "1")) / 1000
+HEADER = "x-profile"
+
+# The request currently being profiled, visible to the DB timing hooks below
+current_profile = contextvars.ContextVar("current_profile", default=None)
+
+
+class RequestProfile:
+    def __init__(self):
+        self.db_seconds = 0.0
+        self.db_queries = 0
+
+
+@event.listens_for(engine.sync_engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if current_profile.get() is not None:
+        conn.info.setdefault("profile_query_start", []).append(time.perf_counter())
+
+
+@event.listens_for(engine.sync_engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profile = current_profile.get()
+    starts = conn.info.get("profile_query_start")
+    if profile is not None and starts:
+        profile.db_seconds += time.perf_counter() - starts.pop()
+        profile.db_queries += 1
+
+
+class StackSampler(threading.Thread):
+    """
+    Samples the event loop thread's Python stack every `interval` seconds
+    and counts collapsed stacks ("a;b;c"), the input format of
+    flamegraph.pl and speedscope. Other requests running concurrently on
+    the same loop show up in the samples too.
+    """
+
+    def __init__(self, thread_id: int, interval: float):
+        super().__init__(daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.counts = Counter()
+        self.stopped = threading.Event()
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                self.counts[";".join(reversed(stack))] += 1
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
+
+
+async def is_admin(user_id) -> bool:
+    async with SessionLocal() as db:
+        result = await db.execute(select(User.is_admin).where(User.id == user_id))
+        return bool(result.scalar_one_or_none())
+
+
+def write_profile(path: str, counts: Counter, summary: dict):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(f"{path}.folded", "w") as fh:
+        for stack, count in counts.most_common():
+            fh.write(f"{stack} {count}\n")
+    with open(f"{path}.json", "w") as fh:
+        json.dump(summary, fh, indent=2)
+
+
+class ProfilingMiddleware:
+    """
+    Profiles a request when an admin sends `X-Profile: 1`, or at random
+    for PROFILE_SAMPLE_RATE of requests. Writes <PROFILE_DIR>/<id>.folded
+    (flamegraph input) and <id>.json (route, wall/DB/Python time).
+    """
+
+    def __init__(self, app, sample_rate: float = PROFILE_SAMPLE_RATE):
+        self.app = app
+        self.sample_rate = sample_rate
+
+    async def should_profile(self, headers: Headers):
+        if headers.get(HEADER) == "1":
+            user_id = request_user_id(headers)
+            return user_id is not None and await is_admin(user_id)
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not await self.should_profile(Headers(scope=scope)):
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = f"{datetime.utcnow():%Y%m%dT%H%M%S%f}-{os.getpid()}"
+        profile = RequestProfile()
+        token = current_profile.set(profile)
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                MutableHeaders(scope=message).append("X-Profile-Id", profile_id)
+            await send(message)
+
+        sampler = StackSampler(threading.get_ident(), PROFILE_INTERVAL_SECONDS)
+        started = time.perf_counter()
+        sampler.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            wall = time.perf_counter() - started
+            sampler.stop()
+            current_profile.reset(token)
+
+            # Routing fills in scope["route"]; fall back to the raw path
+            route = getattr(scope.get("route"), "path", scope["path"])
+            summary = {
+                "id": profile_id,
+                "method": scope["method"],
+                "route": route,
+                "path": scope["path"],
+                "status": status,
+                "wall_ms": round(wall * 1000, 3),
+                "db_ms": round(profile.db_seconds * 1000, 3),
+                "db_queries": profile.db_queries,
+                "python_ms": round(max(wall - profile.db_seconds, 0) * 1000, 3),
+                "samples": sum(sampler.counts.values()),
+            }
+            slug = re.sub(r"[^A-Za-z0-9]+", "_", f"{scope['method']}_{route}").strip("_")
+            path = os.path.join(PROFILE_DIR, f"{profile_id}_{slug}")
+            await asyncio.to_thread(write_profile, path, sampler.counts, summary)
@@ -0,0 +1,81 @@
+import asyncio
+
+from backend.core.cache import TTLCache
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls for the same key inside one worker: the first
+    caller runs the lookup, everyone else awaits its result.
+
+    With negative_ttl > 0, a None result is remembered for that many seconds
+    so repeated lookups of unknown keys don't reach the database either.
+    """
+
+    def __init__(self, negative_ttl: float = 0, maxsize: int = 10000):
+        self.negative_ttl = negative_ttl
+        self._inflight = {}
+        self._negative = TTLCache(ttl=negative_ttl, maxsize=maxsize)
+
+        self.calls = 0
+        self.executions = 0
+        self.coalesced = 0
+        self.negative_hits = 0
+
+    async def do(self, key, fn):
+        self.calls += 1
+
+        if self.negative_ttl and key in self._negative:
+            self.negative_hits += 1
+            return None
+
+        while key in self._inflight:
+            future = self._inflight[key]
+            self.coalesced += 1
+            try:
+                # shield: a follower being cancelled must not cancel the leader
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                # The leader was cancelled, not us: take over the lookup
+                if not future.cancelled():
+                    raise
+                self.coalesced -= 1
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        self.executions += 1
+
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as exc:
+            future.set_exception(exc)
+            # Mark as retrieved so a leader-only failure isn't logged twice
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+        future.set_result(result)
+        if result is None and self.negative_ttl:
+            self._negative.set(key, True)
+        return result
+
+    def forget(self, key=None):
+        # Drop negative entries (all of them when key is None) after writes
+        if key is None:
+            self._negative.clear()
+        else:
+            self._negative.pop(key)
+
+    def stats(self):
+        return {
+            "calls": self.calls,
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "negative_hits": self.negative_hits,
+            "in_flight": len(self._inflight),
+            "coalescing_ratio": (self.calls - self.executions) / self.calls if self.calls else 0.0,
+        }
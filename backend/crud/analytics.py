@@ -0,0 +1,185 @@
+# backend/crud/analytics.py
+from datetime import date, timedelta
+from sqlalchemy import delete, func, insert, literal_column, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.db.dialect import upsert
+from backend.models import DailyProductSales, DailySales, Order, OrderItem, Product
+
+
+async def record_order(db: AsyncSession, day: date, total: float, lines):
+    """
+    Fold one checkout into the daily rollups. `lines` is a list of
+    (product_id, product_name, category_id, quantity, subtotal) tuples.
+    Runs inside the checkout transaction.
+    """
+    items_sold = sum(line[3] for line in lines)
+
+    stmt = upsert(db, DailySales).values(day=day, order_count=1, items_sold=items_sold, revenue=total)
+    await db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[DailySales.day],
+            set_={
+                "order_count": DailySales.order_count + 1,
+                "items_sold": DailySales.items_sold + items_sold,
+                "revenue": DailySales.revenue + total,
+            },
+        )
+    )
+
+    # Merge duplicate products (shouldn't happen, but keeps the upsert valid)
+    per_product = {}
+    for product_id, name, category_id, quantity, subtotal in lines:
+        row = per_product.setdefault(
+            product_id,
+            {"day": day, "product_id": product_id, "product_name": name,
+             "category_id": category_id, "quantity": 0, "revenue": 0.0},
+        )
+        row["quantity"] += quantity
+        row["revenue"] += subtotal
+
+    if not per_product:
+        return
+
+    stmt = upsert(db, DailyProductSales).values(list(per_product.values()))
+    await db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[DailyProductSales.day, DailyProductSales.product_id],
+            set_={
+                "product_name": stmt.excluded.product_name,
+                "category_id": stmt.excluded.category_id,
+                "quantity": DailyProductSales.quantity + stmt.excluded.quantity,
+                "revenue": DailyProductSales.revenue + stmt.excluded.revenue,
+            },
+        )
+    )
+
+
+async def get_revenue_by_day(db: AsyncSession, start: date, end: date):
+    result = await db.execute(
+        select(DailySales)
+        .where(DailySales.day >= start, DailySales.day <= end)
+        .order_by(DailySales.day)
+    )
+    return result.scalars().all()
+
+
+async def get_revenue_by_category(db: AsyncSession, start: date, end: date):
+    result = await db.execute(
+        select(
+            DailyProductSales.category_id,
+            func.sum(DailyProductSales.quantity).label("quantity"),
+            func.sum(DailyProductSales.revenue).label("revenue"),
+        )
+        .where(DailyProductSales.day >= start, DailyProductSales.day <= end)
+        .group_by(DailyProductSales.category_id)
+        .order_by(literal_column("revenue").desc())
+    )
+    return [row._asdict() for row in result.all()]
+
+
+async def get_top_products(db: AsyncSession, start: date, end: date, limit: int = 20):
+    result = await db.execute(
+        select(
+            DailyProductSales.product_id,
+            func.max(DailyProductSales.product_name).label("product_name"),
+            func.sum(DailyProductSales.quantity).label("quantity"),
+            func.sum(DailyProductSales.revenue).label("revenue"),
+        )
+        .where(DailyProductSales.day >= start, DailyProductSales.day <= end)
+        .group_by(DailyProductSales.product_id)
+        .order_by(literal_column("revenue").desc())
+        .limit(limit)
+    )
+    return [row._asdict() for row in result.all()]
+
+
+async def get_average_order_value(db: AsyncSession, start: date, end: date):
+    result = await db.execute(
+        select(
+            func.coalesce(func.sum(DailySales.order_count), 0),
+            func.coalesce(func.sum(DailySales.revenue), 0),
+        ).where(DailySales.day >= start, DailySales.day <= end)
+    )
+    order_count, revenue = result.one()
+    return {
+        "start": start,
+        "end": end,
+        "order_count": order_count,
+        "revenue": revenue,
+        "average_order_value": revenue / order_count if order_count else 0.0,
+    }
+
+
+async def rebuild_rollups(db: AsyncSession, batch_days: int = 7, log=print):
+    """
+    Recompute both rollup tables from orders/order_items, `batch_days` days
+    per transaction so no single statement scans the whole history.
+    """
+    bounds = (await db.execute(select(func.min(Order.created_at), func.max(Order.created_at)))).one()
+    if bounds[0] is None:
+        log("No orders to backfill")
+        return
+
+    first_day, last_day = bounds[0].date(), bounds[1].date()
+    order_day = func.date(Order.created_at)
+
+    window_start = first_day
+    while window_start <= last_day:
+        window_end = min(window_start + timedelta(days=batch_days - 1), last_day)
+        # Half-open timestamp range keeps the created_at index usable
+        in_window = (
+            Order.created_at >= window_start,
+            Order.created_at < window_end + timedelta(days=1),
+        )
+
+        await db.execute(delete(DailySales).where(DailySales.day >= window_start, DailySales.day <= window_end))
+        await db.execute(
+            delete(DailyProductSales).where(DailyProductSales.day >= window_start, DailyProductSales.day <= window_end)
+        )
+
+        items_per_order = (
+            select(OrderItem.order_id, func.sum(OrderItem.quantity).label("item_count"))
+            .join(Order, Order.id == OrderItem.order_id)
+            .where(*in_window)
+            .group_by(OrderItem.order_id)
+            .subquery()
+        )
+        await db.execute(
+            insert(DailySales).from_select(
+                ["day", "order_count", "items_sold", "revenue"],
+                select(
+                    order_day,
+                    func.count(Order.id),
+                    func.coalesce(func.sum(items_per_order.c.item_count), 0),
+                    func.coalesce(func.sum(Order.total_amount), 0),
+                )
+                .outerjoin(items_per_order, items_per_order.c.order_id == Order.id)
+                .where(*in_window)
+                .group_by(order_day),
+            )
+        )
+
+        # Historical lines have no category snapshot, so use the product's current one
+        await db.execute(
+            insert(DailyProductSales).from_select(
+                ["day", "product_id", "product_name", "category_id", "quantity", "revenue"],
+                select(
+                    order_day,
+                    OrderItem.product_id,
+                    func.max(OrderItem.product_name),
+                    func.max(Product.category_id),
+                    func.sum(OrderItem.quantity),
+                    func.sum(OrderItem.subtotal),
+                )
+                .select_from(OrderItem)
+                .join(Order, Order.id == OrderItem.order_id)
+                .outerjoin(Product, Product.id == OrderItem.product_id)
+                .where(*in_window)
+                .group_by(order_day, OrderItem.product_id),
+            )
+        )
+
+        await db.commit()
+        log(f"Rebuilt rollups for {window_start} .. {window_end}")
+        window_start = window_end + timedelta(days=1)
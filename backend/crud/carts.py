@@ -0,0 +1,103 @@
+# backend/crud/carts.py
+import os
+import uuid
+from datetime import datetime, timedelta
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.db.dialect import is_postgres, upsert
+from backend.models import Cart, CartItem, Product
+
+# Carts untouched for this long are deleted by the sweeper
+CART_TTL_DAYS = int(os.getenv("CART_TTL_DAYS", "30"))
+# Carts deleted per transaction; keeps each sweep's locks short
+CART_SWEEP_BATCH_SIZE = int(os.getenv("CART_SWEEP_BATCH_SIZE", "500"))
+
+
+async def get_or_create_cart(db: AsyncSession, user_id):
+    result = await db.execute(select(Cart).where(Cart.user_id == user_id))
+    cart = result.scalars().first()
+
+    if not cart:
+        cart = Cart(user_id=user_id)
+        db.add(cart)
+        await db.flush()
+    else:
+        cart.last_active_at = datetime.utcnow()
+
+    return cart
+
+
+async def merge_guest_cart(db: AsyncSession, user_id, items: dict):
+    """
+    Fold a guest cart ({product_id: quantity}) into the user's persistent
+    cart with one INSERT ... ON CONFLICT that adds to existing quantities.
+    Products that were deleted since they went into the cookie are skipped.
+    """
+    if not items:
+        return 0
+
+    result = await db.execute(
+        select(Product.id).where(Product.id.in_(list(items)), Product.is_active == True)
+    )
+    product_ids = sorted(result.scalars().all())
+    if not product_ids:
+        return 0
+
+    cart = await get_or_create_cart(db, user_id)
+
+    stmt = upsert(db, CartItem).values([
+        {"id": uuid.uuid4(), "cart_id": cart.id, "product_id": product_id, "quantity": items[product_id]}
+        for product_id in product_ids
+    ])
+    await db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[CartItem.cart_id, CartItem.product_id],
+            set_={"quantity": CartItem.quantity + stmt.excluded.quantity},
+        )
+    )
+    await db.commit()
+    return len(product_ids)
+
+
+async def sweep_abandoned_carts(
+    db: AsyncSession,
+    ttl_days: int = CART_TTL_DAYS,
+    batch_size: int = CART_SWEEP_BATCH_SIZE,
+):
+    """
+    Delete carts idle for more than `ttl_days`, `batch_size` carts per
+    transaction. On Postgres the batch is claimed with FOR UPDATE SKIP
+    LOCKED, so carts being written right now are skipped rather than
+    waited on, and several workers can sweep at once.
+    Returns the number of carts and cart items reclaimed.
+    """
+    cutoff = datetime.utcnow() - timedelta(days=ttl_days)
+    reclaimed = {"carts": 0, "cart_items": 0}
+
+    while True:
+        query = (
+            select(Cart.id)
+            .where(Cart.last_active_at < cutoff)
+            .order_by(Cart.last_active_at)
+            .limit(batch_size)
+        )
+        if is_postgres(db):
+            query = query.with_for_update(skip_locked=True)
+        cart_ids = (await db.execute(query)).scalars().all()
+        if not cart_ids:
+            break
+
+        # Re-check the cutoff in the deletes: a cart touched by add_to_cart
+        # since the select above is active again and must be kept
+        still_idle = select(Cart.id).where(Cart.id.in_(cart_ids), Cart.last_active_at < cutoff)
+        items = await db.execute(delete(CartItem).where(CartItem.cart_id.in_(still_idle)))
+        carts = await db.execute(delete(Cart).where(Cart.id.in_(cart_ids), Cart.last_active_at < cutoff))
+        await db.commit()
+
+        reclaimed["cart_items"] += items.rowcount
+        reclaimed["carts"] += carts.rowcount
+        if len(cart_ids) < batch_size:
+            break
+
+    return reclaimed
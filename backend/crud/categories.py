@@ -1,20 +1,78 @@
 # backend/crud/category.py
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from backend.models.product import Category  # Adjust path to where your Category model is
+from sqlalchemy import delete, func, update
+from backend.models.product import Category, CategoryProductCount, Product  # Adjust path to where your Category model is
 from backend.schemas.product import CategoryCreate # Adjust path to your schemas
 
 async def create_category(db: AsyncSession, category: CategoryCreate):
     db_category = Category(name=category.name)
     db.add(db_category)
+    await db.flush()
+    # Every category starts with an empty counts row so later updates never need an upsert
+    db.add(CategoryProductCount(category_id=db_category.id, active_count=0))
     await db.commit()
     await db.refresh(db_category)
     return db_category
 
-async def get_categories(db: AsyncSession, skip: int = 0, limit: int = 100):
-    result = await db.execute(select(Category).offset(skip).limit(limit))
-    return result.scalars().all()
+async def get_categories(db: AsyncSession, skip: int = 0, limit: int = 100, with_counts: bool = False):
+    if not with_counts:
+        result = await db.execute(select(Category).offset(skip).limit(limit))
+        return result.scalars().all()
+
+    result = await db.execute(
+        select(Category, func.coalesce(CategoryProductCount.active_count, 0))
+        .outerjoin(CategoryProductCount, CategoryProductCount.category_id == Category.id)
+        .order_by(Category.id)
+        .offset(skip)
+        .limit(limit)
+    )
+    return [with_product_count(category, count) for category, count in result.all()]
 
 async def get_category(db: AsyncSession, category_id: int):
     result = await db.execute(select(Category).filter(Category.id == category_id))
-    return result.scalars().first()
\ No newline at end of file
+    return result.scalars().first()
+
+async def get_category_product_count(db: AsyncSession, category_id: int):
+    result = await db.execute(
+        select(CategoryProductCount.active_count).where(CategoryProductCount.category_id == category_id)
+    )
+    return result.scalar_one_or_none() or 0
+
+def with_product_count(category: Category, count: int):
+    return {
+        "id": category.id,
+        "name": category.name,
+        "created_at": category.created_at,
+        "product_count": count,
+    }
+
+async def adjust_category_count(db: AsyncSession, category_id, delta: int):
+    # Runs inside the caller's transaction, so the rollup commits with the product write
+    if category_id is None or delta == 0:
+        return
+    await db.execute(
+        update(CategoryProductCount)
+        .where(CategoryProductCount.category_id == category_id)
+        .values(active_count=CategoryProductCount.active_count + delta)
+    )
+
+async def delete_category_counts(db: AsyncSession, category_id: int):
+    await db.execute(delete(CategoryProductCount).where(CategoryProductCount.category_id == category_id))
+
+async def refresh_category_counts(db: AsyncSession, category_ids):
+    # Recount from products; used after set-based writes where per-row
+    # deltas aren't known (e.g. bulk activation)
+    category_ids = [c for c in set(category_ids) if c is not None]
+    if not category_ids:
+        return
+    active = (
+        select(func.count(Product.id))
+        .where(Product.category_id == CategoryProductCount.category_id, Product.is_active == True)
+        .scalar_subquery()
+    )
+    await db.execute(
+        update(CategoryProductCount)
+        .where(CategoryProductCount.category_id.in_(category_ids))
+        .values(active_count=active)
+    )
@@ -0,0 +1,106 @@
+# backend/crud/orders.py
+import base64
+import json
+import os
+import uuid
+from datetime import datetime
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+
+from backend.core.cache import TTLCache
+from backend.db.dialect import is_postgres
+from backend.models import Order
+
+# Totals for the admin order list; a minute of staleness is fine for a
+# dashboard and saves a COUNT(*) over every partition on each page
+order_count_cache = TTLCache(ttl=60, maxsize=512)
+# Planner estimates below this are replaced by an exact COUNT: small
+# results are cheap to count and stale statistics skew them the most
+ORDER_EXACT_COUNT_BELOW = int(os.getenv("ORDER_EXACT_COUNT_BELOW", "10000"))
+
+
+def encode_cursor(order: Order) -> str:
+    # Opaque to clients: the (created_at, id) of the last row on the page
+    raw = json.dumps([order.created_at.isoformat(), str(order.id)]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str):
+    # Raises ValueError for anything that isn't a cursor we issued
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, order_id = json.loads(raw)
+        return datetime.fromisoformat(created_at), uuid.UUID(order_id)
+    except (TypeError, json.JSONDecodeError) as exc:
+        raise ValueError("Invalid cursor") from exc
+
+
+def order_filters(
+    status: Optional[str] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    user_id: Optional[uuid.UUID] = None,
+):
+    # Date bounds are on the partition key, so Postgres prunes partitions
+    conditions = []
+    if status is not None:
+        conditions.append(Order.status == status)
+    if created_from is not None:
+        conditions.append(Order.created_at >= created_from)
+    if created_to is not None:
+        conditions.append(Order.created_at < created_to)
+    if user_id is not None:
+        conditions.append(Order.user_id == user_id)
+    return conditions
+
+
+async def list_orders(db: AsyncSession, filters: dict, cursor: Optional[str] = None, limit: int = 50):
+    """
+    One page of orders, newest first, keyset-paginated on (created_at, id):
+    every page costs the same however deep the client scrolls. Returns
+    (orders, next_cursor); next_cursor is None on the last page.
+    """
+    query = select(Order).where(*order_filters(**filters))
+    if cursor is not None:
+        query = query.where(tuple_(Order.created_at, Order.id) < tuple_(*decode_cursor(cursor)))
+
+    result = await db.execute(
+        query.order_by(Order.created_at.desc(), Order.id.desc()).limit(limit + 1)
+    )
+    orders = result.scalars().all()
+
+    if len(orders) > limit:
+        orders = orders[:limit]
+        return orders, encode_cursor(orders[-1])
+    return orders, None
+
+
+async def estimate_order_count(db: AsyncSession, filters: dict):
+    """
+    Postgres: the planner's row estimate for the filtered query (no scan),
+    unless it is under ORDER_EXACT_COUNT_BELOW. Elsewhere: an exact count.
+    Either way cached per filter set. Returns (count, is_estimate).
+    """
+    key = tuple(sorted(filters.items()))
+    cached = order_count_cache.get(key)
+    if cached is not None:
+        return cached
+
+    query = select(Order.id).where(*order_filters(**filters))
+    counted = None
+    if is_postgres(db):
+        # Literal values so the planner estimates for these exact filters
+        conn = await db.connection()
+        sql = query.compile(dialect=conn.dialect, compile_kwargs={"literal_binds": True})
+        plan = (await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}")).scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        counted = (int(plan[0]["Plan"]["Plan Rows"]), True)
+
+    if counted is None or counted[0] < ORDER_EXACT_COUNT_BELOW:
+        total = await db.execute(select(func.count()).select_from(query.subquery()))
+        counted = (total.scalar_one(), False)
+
+    order_count_cache.set(key, counted)
+    return counted
@@ -0,0 +1,168 @@
+# backend/crud/products.py
+import os
+from datetime import datetime, timedelta
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import Numeric, case, cast, func, select, update
+from typing import Optional
+
+from backend.core.cache import TTLCache
+from backend.core.prefix_index import PrefixIndex
+from backend.core.singleflight import SingleFlight
+from backend.crud.categories import refresh_category_counts
+from backend.crud.recommendations import related_cache
+from backend.models.analytics import DailyProductSales
+from backend.models.product import Product
+from backend.schemas.product import ProductBulkUpdateRequest
+
+# Upper bounds of the price buckets shown in the filter sidebar; the last
+# bucket is open-ended ("200+")
+PRICE_BUCKETS = (25, 50, 100, 200)
+
+facet_cache = TTLCache(maxsize=256)
+
+# Concurrent GET /products/{id} for the same id share one query; unknown ids
+# are remembered briefly (0 disables negative caching)
+PRODUCT_NEGATIVE_TTL_SECONDS = float(os.getenv("PRODUCT_NEGATIVE_TTL_SECONDS", "5"))
+product_flight = SingleFlight(negative_ttl=PRODUCT_NEGATIVE_TTL_SECONDS)
+
+# Per-worker typeahead index over active product names, weighted by recent
+# sales. Writes in this worker update it in place; the periodic rebuild in
+# main.py picks up writes handled by other workers.
+AUTOCOMPLETE_POPULARITY_DAYS = 90
+autocomplete_index = PrefixIndex()
+
+
+def invalidate_product_caches():
+    # Called by every route that writes products
+    facet_cache.clear()
+    product_flight.forget()
+    related_cache.clear()
+
+
+def price_bucket_expression():
+    return case(
+        *[(Product.price < upper, i) for i, upper in enumerate(PRICE_BUCKETS)],
+        else_=len(PRICE_BUCKETS),
+    )
+
+
+def bucket_bounds(index: int):
+    lower = PRICE_BUCKETS[index - 1] if index > 0 else 0
+    upper = PRICE_BUCKETS[index] if index < len(PRICE_BUCKETS) else None
+    label = f"{lower}-{upper}" if upper is not None else f"{lower}+"
+    return label, lower, upper
+
+
+async def get_product_facets(
+    db: AsyncSession,
+    category_id: Optional[int] = None,
+    min_price: Optional[float] = None,
+    max_price: Optional[float] = None,
+):
+    key = (category_id, min_price, max_price)
+    cached = facet_cache.get(key)
+    if cached is not None:
+        return cached
+
+    # One GROUP BY over (category, price bucket). The price filter applies to
+    # both facets; the category filter only narrows the price buckets so the
+    # sidebar can still show counts for the other categories.
+    bucket = price_bucket_expression().label("bucket")
+    query = (
+        select(Product.category_id, bucket, func.count().label("count"))
+        .where(Product.is_active == True)
+        .group_by(Product.category_id, bucket)
+    )
+    if min_price is not None:
+        query = query.where(Product.price >= min_price)
+    if max_price is not None:
+        query = query.where(Product.price <= max_price)
+
+    rows = (await db.execute(query)).all()
+
+    categories = {}
+    buckets = [0] * (len(PRICE_BUCKETS) + 1)
+    for row in rows:
+        categories[row.category_id] = categories.get(row.category_id, 0) + row.count
+        if category_id is None or row.category_id == category_id:
+            buckets[row.bucket] += row.count
+
+    price_buckets = []
+    for i, count in enumerate(buckets):
+        label, lower, upper = bucket_bounds(i)
+        price_buckets.append(
+            {"label": label, "min_price": lower, "max_price": upper, "count": count}
+        )
+
+    facets = {
+        "total": sum(buckets),
+        "categories": [
+            {"category_id": cid, "count": count}
+            for cid, count in sorted(categories.items(), key=lambda item: -item[1])
+        ],
+        "price_buckets": price_buckets,
+    }
+
+    facet_cache.set(key, facets)
+    return facets
+
+
+async def build_autocomplete_index(db: AsyncSession):
+    since = datetime.utcnow().date() - timedelta(days=AUTOCOMPLETE_POPULARITY_DAYS)
+    popularity = (
+        select(DailyProductSales.product_id, func.sum(DailyProductSales.quantity).label("sold"))
+        .where(DailyProductSales.day >= since)
+        .group_by(DailyProductSales.product_id)
+        .subquery()
+    )
+    result = await db.execute(
+        select(Product.id, Product.name, func.coalesce(popularity.c.sold, 0))
+        .outerjoin(popularity, popularity.c.product_id == Product.id)
+        .where(Product.is_active == True)
+    )
+    autocomplete_index.replace(result.all())
+
+
+async def bulk_update_products(db: AsyncSession, changes: ProductBulkUpdateRequest):
+    """
+    Apply one price and/or status change to every product matching the
+    filters in a single UPDATE ... RETURNING. Products whose new price would
+    be zero or below are left untouched. Returns the updated rows.
+    """
+    conditions = []
+    if changes.ids is not None:
+        conditions.append(Product.id.in_(changes.ids))
+    if changes.category_id is not None:
+        conditions.append(Product.category_id == changes.category_id)
+    if changes.min_price is not None:
+        conditions.append(Product.price >= changes.min_price)
+    if changes.max_price is not None:
+        conditions.append(Product.price <= changes.max_price)
+
+    values = {}
+    if changes.price_percent is not None or changes.price_delta is not None:
+        if changes.price_percent is not None:
+            new_price = Product.price * (1 + changes.price_percent / 100)
+        else:
+            new_price = Product.price + changes.price_delta
+        # Round in the database to whole cents (Postgres only rounds numerics)
+        new_price = func.round(cast(new_price, Numeric), 2)
+        conditions.append(new_price > 0)
+        values["price"] = new_price
+    if changes.is_active is not None:
+        values["is_active"] = changes.is_active
+
+    result = await db.execute(
+        update(Product)
+        .where(*conditions)
+        .values(**values)
+        .returning(Product.id, Product.name, Product.price, Product.is_active, Product.category_id)
+        .execution_options(synchronize_session=False)
+    )
+    rows = result.all()
+
+    if changes.is_active is not None:
+        await refresh_category_counts(db, [row.category_id for row in rows])
+
+    await db.commit()
+    return rows
@@ -0,0 +1,184 @@
+# backend/crud/recommendations.py
+import os
+from itertools import permutations
+from datetime import datetime
+from sqlalchemy import Column, Integer, MetaData, Table, Uuid, delete, func, insert, select, text, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased, joinedload
+
+from backend.core.cache import TTLCache
+from backend.db.dialect import is_postgres, upsert
+from backend.db.partitions import add_months, month_start
+from backend.models import Order, OrderItem, Product, ProductCooccurrence
+from backend.schemas.product import ProductResponse
+
+# Rows kept per product after a rebuild; more than we serve so incremental
+# updates from checkout can still promote a product into the top K
+COOCCURRENCE_KEEP = int(os.getenv("COOCCURRENCE_KEEP", "50"))
+# Orders with more distinct products than this only count the N lowest
+# product ids, so one huge order can't write N^2 rows inside checkout. The
+# rebuild applies the same cap so both paths give the same scores.
+MAX_PAIR_PRODUCTS = 20
+
+related_cache = TTLCache(ttl=300, maxsize=5000)
+
+# Rebuilds fill this and swap it in at the end, so /related keeps serving the
+# old index meanwhile. Created and dropped by rebuild_cooccurrence.
+staging = Table(
+    "product_cooccurrence_staging",
+    MetaData(),
+    Column("product_id", Uuid, primary_key=True),
+    Column("related_product_id", Uuid, primary_key=True),
+    Column("score", Integer, nullable=False),
+)
+
+
+async def record_order_pairs(db: AsyncSession, product_ids):
+    """Add one co-occurrence for every pair of products in a new order."""
+    product_ids = sorted(set(product_ids))[:MAX_PAIR_PRODUCTS]
+    if len(product_ids) < 2:
+        return
+
+    # Sorted so concurrent checkouts lock rows in the same order
+    rows = [
+        {"product_id": a, "related_product_id": b, "score": 1}
+        for a, b in sorted(permutations(product_ids, 2))
+    ]
+
+    stmt = upsert(db, ProductCooccurrence).values(rows)
+    await db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[ProductCooccurrence.product_id, ProductCooccurrence.related_product_id],
+            set_={"score": ProductCooccurrence.score + stmt.excluded.score},
+        )
+    )
+
+
+async def get_related_products(db: AsyncSession, product_id, limit: int = 10):
+    key = (product_id, limit)
+    cached = related_cache.get(key)
+    if cached is not None:
+        return cached
+
+    result = await db.execute(
+        select(Product)
+        .options(joinedload(Product.category))
+        .join(ProductCooccurrence, ProductCooccurrence.related_product_id == Product.id)
+        .where(ProductCooccurrence.product_id == product_id, Product.is_active == True)
+        .order_by(ProductCooccurrence.score.desc(), Product.id)
+        .limit(limit)
+    )
+    # Cache plain dicts, not ORM objects bound to this request's session
+    related = [ProductResponse.model_validate(p).model_dump() for p in result.scalars().all()]
+
+    related_cache.set(key, related)
+    return related
+
+
+async def prune_cooccurrence(db: AsyncSession, keep: int = COOCCURRENCE_KEEP, table=ProductCooccurrence.__table__):
+    ranked = select(
+        table.c.product_id,
+        table.c.related_product_id,
+        func.row_number().over(
+            partition_by=table.c.product_id,
+            order_by=table.c.score.desc(),
+        ).label("rank"),
+    ).subquery()
+
+    await db.execute(
+        delete(table).where(
+            tuple_(table.c.product_id, table.c.related_product_id).in_(
+                select(ranked.c.product_id, ranked.c.related_product_id).where(ranked.c.rank > keep)
+            )
+        )
+    )
+
+
+async def index_orders(db: AsyncSession, start, end=None):
+    # Merge the pairs from orders created in [start, end) into the staging table
+    conditions = [OrderItem.product_id.isnot(None), OrderItem.order_created_at >= start]
+    if end is not None:
+        conditions.append(OrderItem.order_created_at < end)
+
+    # Rank each order's products by id to apply checkout's MAX_PAIR_PRODUCTS cap
+    lines = select(
+        OrderItem.order_id,
+        OrderItem.order_created_at,
+        OrderItem.product_id,
+        func.dense_rank().over(
+            partition_by=(OrderItem.order_id, OrderItem.order_created_at),
+            order_by=OrderItem.product_id,
+        ).label("rank"),
+    ).where(*conditions).subquery()
+    a = lines.alias("a")
+    b = lines.alias("b")
+
+    # Joining on order_created_at too keeps the self-join inside one partition
+    pairs = (
+        select(a.c.product_id, b.c.product_id, func.count(func.distinct(a.c.order_id)))
+        .select_from(a)
+        .join(b, (a.c.order_id == b.c.order_id) & (a.c.order_created_at == b.c.order_created_at))
+        .where(
+            a.c.product_id != b.c.product_id,
+            a.c.rank <= MAX_PAIR_PRODUCTS,
+            b.c.rank <= MAX_PAIR_PRODUCTS,
+        )
+        .group_by(a.c.product_id, b.c.product_id)
+    )
+    stmt = upsert(db, staging).from_select(["product_id", "related_product_id", "score"], pairs)
+    await db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[staging.c.product_id, staging.c.related_product_id],
+            set_={"score": staging.c.score + stmt.excluded.score},
+        )
+    )
+
+
+async def rebuild_cooccurrence(db: AsyncSession, keep: int = COOCCURRENCE_KEEP, log=print):
+    """
+    Recompute the whole index from order_items into a staging table, one
+    month of orders per transaction, trim every product to its top `keep`
+    neighbours, then swap it in. The live index keeps serving until the swap.
+
+    Checkout keeps writing to the live index during the build, so the current
+    month is only counted at swap time, with checkouts locked out. Orders
+    committed before the swap are counted by the rebuild, later ones by
+    checkout, and none twice.
+    """
+    await db.run_sync(lambda session: staging.drop(session.connection(), checkfirst=True))
+    await db.run_sync(lambda session: staging.create(session.connection()))
+    await db.commit()
+
+    first = (await db.execute(select(func.min(Order.created_at)))).scalar()
+    current = month_start(datetime.utcnow())
+    month = month_start(first) if first is not None else current
+    while month < current:
+        await index_orders(db, month, add_months(month, 1))
+        await db.commit()
+        log(f"Indexed orders from {month:%Y-%m}")
+        month = add_months(month, 1)
+
+    # Trimming the history now keeps the one under the lock below small
+    await prune_cooccurrence(db, keep, table=staging)
+    await db.commit()
+
+    # Swap in one transaction: readers see the old rows until it commits.
+    # The lock waits for in-flight checkouts and holds new ones until the
+    # swap is done
+    if is_postgres(db):
+        await db.execute(text("LOCK TABLE product_cooccurrence IN SHARE ROW EXCLUSIVE MODE"))
+    await index_orders(db, current)
+    await prune_cooccurrence(db, keep, table=staging)
+    await db.execute(delete(ProductCooccurrence))
+    await db.execute(
+        insert(ProductCooccurrence).from_select(
+            ["product_id", "related_product_id", "score"],
+            select(staging.c.product_id, staging.c.related_product_id, staging.c.score),
+        )
+    )
+    await db.commit()
+    related_cache.clear()
+    log(f"Indexed orders from {current:%Y-%m} and swapped in the top {keep} related products each")
+
+    await db.run_sync(lambda session: staging.drop(session.connection()))
+    await db.commit()
@@ -0,0 +1,36 @@
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import make_url
+
+# Postgres is the production database; SQLite (aiosqlite) runs the app and
+# test suite without a server. Anything Postgres-only checks these first.
+
+# Sync-style URLs are mapped onto the async driver for their dialect
+ASYNC_DRIVERS = {
+    "postgres": "postgresql+asyncpg",
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def async_database_url(url: str):
+    url = make_url(url)
+    return url.set(drivername=ASYNC_DRIVERS.get(url.drivername, url.drivername))
+
+
+def dialect_name(bind) -> str:
+    # Accepts an AsyncSession, AsyncEngine or (async) connection
+    if hasattr(bind, "dialect"):
+        return bind.dialect.name
+    return bind.bind.dialect.name
+
+
+def is_postgres(bind) -> bool:
+    return dialect_name(bind) == "postgresql"
+
+
+def upsert(bind, model):
+    # Both dialects' insert() support on_conflict_do_update/excluded
+    if is_postgres(bind):
+        return postgresql.insert(model)
+    return sqlite.insert(model)
@@ -0,0 +1,174 @@
+import os
+import time
+from alembic import op
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+
+# Helpers for schema changes that must not block live traffic. Import them
+# in migration scripts instead of the plain op.* calls, e.g.
+#
+#     from backend.db.migrations import create_index_concurrently
+#     create_index_concurrently("ix_orders_status_created_at", "orders", ["status", "created_at"])
+#
+# On anything but Postgres they fall back to the ordinary operations.
+
+# How long one DDL statement may queue for its lock before giving up. Short on
+# purpose: a DDL waiting on a lock also blocks every query queued behind it.
+LOCK_TIMEOUT = os.getenv("MIGRATION_LOCK_TIMEOUT", "1s")
+LOCK_RETRIES = int(os.getenv("MIGRATION_LOCK_RETRIES", "10"))
+LOCK_RETRY_DELAY_SECONDS = float(os.getenv("MIGRATION_LOCK_RETRY_DELAY", "0.5"))
+BACKFILL_BATCH_SIZE = int(os.getenv("MIGRATION_BACKFILL_BATCH_SIZE", "5000"))
+
+LOCK_NOT_AVAILABLE = "55P03"
+
+
+def _is_postgres():
+    return op.get_bind().dialect.name == "postgresql"
+
+
+def _is_lock_timeout(exc: DBAPIError):
+    orig = exc.orig
+    code = getattr(orig, "sqlstate", None) or getattr(orig, "pgcode", None)
+    return code == LOCK_NOT_AVAILABLE or "lock timeout" in str(orig)
+
+
+def with_lock_timeout(statement, timeout: str = LOCK_TIMEOUT, retries: int = LOCK_RETRIES,
+                      delay: float = LOCK_RETRY_DELAY_SECONDS):
+    """
+    Run `statement` (SQL text or a callable doing op.* calls) under a short
+    lock_timeout, retrying with backoff when it can't get its lock. Each
+    attempt is a savepoint, so a timed-out attempt releases what it took.
+    """
+    run = statement if callable(statement) else (lambda: op.execute(statement))
+    if not _is_postgres():
+        run()
+        return
+
+    bind = op.get_bind()
+    for attempt in range(retries + 1):
+        try:
+            with bind.begin_nested():
+                bind.execute(text(f"SET LOCAL lock_timeout = '{timeout}'"))
+                run()
+            return
+        except DBAPIError as exc:
+            if not _is_lock_timeout(exc) or attempt == retries:
+                raise
+            time.sleep(delay * 2 ** min(attempt, 5))
+
+
+def _index_valid(bind, name: str):
+    # None when the index doesn't exist; False for a leftover from a failed
+    # CONCURRENTLY build, which has to be dropped before retrying
+    return bind.execute(
+        text("SELECT i.indisvalid FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid WHERE c.relname = :name"),
+        {"name": name},
+    ).scalar()
+
+
+def _partitions(bind, table: str):
+    return bind.execute(
+        text(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "JOIN pg_class p ON p.oid = i.inhparent "
+            "WHERE p.relname = :table ORDER BY c.relname"
+        ),
+        {"table": table},
+    ).scalars().all()
+
+
+def _is_partitioned(bind, table: str):
+    return bind.execute(
+        text("SELECT relkind = 'p' FROM pg_class WHERE relname = :table"), {"table": table}
+    ).scalar()
+
+
+def _create_index_sql(name: str, table: str, columns, unique: bool, concurrently: bool, only: bool = False):
+    return (
+        f"CREATE {'UNIQUE ' if unique else ''}INDEX {'CONCURRENTLY ' if concurrently else ''}"
+        f"IF NOT EXISTS {name} ON {'ONLY ' if only else ''}{table} ({', '.join(columns)})"
+    )
+
+
+def _build_concurrently(bind, name: str, table: str, columns, unique: bool):
+    if _index_valid(bind, name) is False:
+        bind.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {name}"))
+    bind.execute(text(_create_index_sql(name, table, columns, unique, concurrently=True)))
+
+
+def create_index_concurrently(name: str, table: str, columns, unique: bool = False):
+    """
+    CREATE INDEX CONCURRENTLY, outside the migration's transaction, so writes
+    to `table` carry on during the build. Safe to re-run after a failure.
+
+    Postgres can't build an index on a partitioned table concurrently, so for
+    orders/order_items the parent index is created ON ONLY (metadata only),
+    each partition is indexed concurrently, and the partition indexes are
+    attached; the parent index turns valid once every partition has one.
+    """
+    if not _is_postgres():
+        op.create_index(name, table, columns, unique=unique)
+        return
+
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+        if not _is_partitioned(bind, table):
+            _build_concurrently(bind, name, table, columns, unique)
+            return
+
+        bind.execute(text(_create_index_sql(name, table, columns, unique, concurrently=False, only=True)))
+        for partition in _partitions(bind, table):
+            partition_index = f"{name}_{partition[len(table) + 1:]}"[:63]
+            _build_concurrently(bind, partition_index, partition, columns, unique)
+            attached = bind.execute(
+                text(
+                    "SELECT 1 FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+                    "WHERE c.relname = :child AND i.inhparent = CAST(:parent AS regclass)"
+                ),
+                {"child": partition_index, "parent": name},
+            ).scalar()
+            if not attached:
+                bind.execute(text(f"ALTER INDEX {name} ATTACH PARTITION {partition_index}"))
+
+
+def drop_index_concurrently(name: str, table: str):
+    if not _is_postgres():
+        op.drop_index(name, table_name=table)
+        return
+
+    if _is_partitioned(op.get_bind(), table):
+        # Dropping a partitioned index can't be CONCURRENTLY; the parent
+        # drop cascades to the attached partition indexes
+        with_lock_timeout(f"DROP INDEX IF EXISTS {name}")
+        return
+
+    with op.get_context().autocommit_block():
+        op.get_bind().execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {name}"))
+
+
+def backfill_in_batches(table: str, set_clause: str, where: str, key: str = "id",
+                        batch_size: int = BACKFILL_BATCH_SIZE, pause: float = 0.0, log=print):
+    """
+    Fill a new column without one long table-wide UPDATE: `batch_size` rows
+    per statement, each committed on its own, until `where` matches nothing.
+    `where` must stop matching rows once they are filled, e.g.
+    backfill_in_batches("orders", "status = 'pending'", "status IS NULL").
+    """
+    total = 0
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+        while True:
+            result = bind.execute(
+                text(
+                    f"UPDATE {table} SET {set_clause} "
+                    f"WHERE {key} IN (SELECT {key} FROM {table} WHERE {where} LIMIT {int(batch_size)})"
+                )
+            )
+            if result.rowcount <= 0:
+                break
+            total += result.rowcount
+            log(f"Backfilled {total} rows in {table}")
+            if pause:
+                time.sleep(pause)
+    return total
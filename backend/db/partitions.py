@@ -0,0 +1,140 @@
+import os
+from datetime import date, datetime
+from sqlalchemy import text
+
+from backend.db.dialect import is_postgres
+
+# orders and order_items are range-partitioned by month on the order's
+# created_at; matching partitions share a suffix, e.g. orders_p2026_10 and
+# order_items_p2026_10, so an order and its items always live side by side.
+PARTITIONED_TABLES = ("orders", "order_items")
+PARTITIONS_AHEAD = int(os.getenv("ORDER_PARTITIONS_AHEAD", "3"))
+PARTITION_LOCK_ID = 7263002
+
+
+def month_start(value) -> date:
+    return date(value.year, value.month, 1)
+
+
+def add_months(month: date, count: int) -> date:
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    return f"{table}_p{month.year:04d}_{month.month:02d}"
+
+
+def parse_partition_month(table: str, name: str):
+    # "orders_p2026_10" -> date(2026, 10, 1); None for the default partition
+    prefix = f"{table}_p"
+    if not name.startswith(prefix):
+        return None
+    try:
+        year, month = name[len(prefix):].split("_")
+        return date(int(year), int(month), 1)
+    except ValueError:
+        return None
+
+
+def create_partition_sql(table: str, month: date) -> str:
+    return (
+        f"CREATE TABLE IF NOT EXISTS {partition_name(table, month)} "
+        f"PARTITION OF {table} "
+        f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+    )
+
+
+def create_default_partition_sql(table: str) -> str:
+    # Catches rows outside every monthly range instead of failing the insert
+    return f"CREATE TABLE IF NOT EXISTS {table}_default PARTITION OF {table} DEFAULT"
+
+
+def partition_statements(first_month: date, last_month: date):
+    statements = []
+    month = first_month
+    while month <= last_month:
+        for table in PARTITIONED_TABLES:
+            statements.append(create_partition_sql(table, month))
+        month = add_months(month, 1)
+    for table in PARTITIONED_TABLES:
+        statements.append(create_default_partition_sql(table))
+    return statements
+
+
+async def ensure_order_partitions(conn, months_ahead: int = PARTITIONS_AHEAD):
+    """
+    Create this month's partitions and the next `months_ahead`, plus the
+    default partitions. Safe to call on every startup and from the periodic
+    task in main.py, which keeps long-running workers a few months ahead.
+    """
+    # Partitioning is Postgres-only; elsewhere the tables are plain
+    if not is_postgres(conn):
+        return
+
+    # Workers run this concurrently; one at a time is enough
+    await conn.execute(text(f"SELECT pg_advisory_xact_lock({PARTITION_LOCK_ID})"))
+
+    for table in PARTITIONED_TABLES:
+        await conn.execute(text(create_default_partition_sql(table)))
+
+    existing = set(await list_partitions(conn, "orders"))
+    month = month_start(datetime.utcnow())
+    last_month = add_months(month, months_ahead)
+    while month <= last_month:
+        if partition_name("orders", month) not in existing:
+            await create_month_partitions(conn, month)
+        month = add_months(month, 1)
+
+
+async def create_month_partitions(conn, month: date):
+    start, end = month.isoformat(), add_months(month, 1).isoformat()
+    stranded = await conn.execute(
+        text("SELECT EXISTS (SELECT 1 FROM orders_default WHERE created_at >= :start AND created_at < :end)"),
+        {"start": month, "end": add_months(month, 1)},
+    )
+    if not stranded.scalar():
+        for table in PARTITIONED_TABLES:
+            await conn.execute(text(create_partition_sql(table, month)))
+        return
+
+    # Orders for this month already went to the default partitions (nothing
+    # created the month in time), and Postgres refuses to add a partition
+    # whose range still has rows in the default one. Build the partitions as
+    # plain tables, move the rows over and attach them, all in this
+    # transaction with writes to the defaults held off until it commits.
+    await conn.execute(text("LOCK TABLE orders_default, order_items_default IN EXCLUSIVE MODE"))
+    for table, key in (("orders", "created_at"), ("order_items", "order_created_at")):
+        name = partition_name(table, month)
+        await conn.execute(text(f"CREATE TABLE {name} (LIKE {table} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"))
+        await conn.execute(text(
+            f"INSERT INTO {name} SELECT * FROM {table}_default "
+            f"WHERE {key} >= '{start}' AND {key} < '{end}'"
+        ))
+    # Items first: they reference the orders being moved
+    await conn.execute(text(
+        f"DELETE FROM order_items_default WHERE order_created_at >= '{start}' AND order_created_at < '{end}'"
+    ))
+    await conn.execute(text(f"DELETE FROM orders_default WHERE created_at >= '{start}' AND created_at < '{end}'"))
+    for table in PARTITIONED_TABLES:
+        await conn.execute(text(
+            f"ALTER TABLE {table} ATTACH PARTITION {partition_name(table, month)} "
+            f"FOR VALUES FROM ('{start}') TO ('{end}')"
+        ))
+
+
+async def list_partitions(conn, table: str):
+    result = await conn.execute(
+        text(
+            """
+            SELECT child.relname
+            FROM pg_inherits
+            JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE parent.relname = :table
+            ORDER BY child.relname
+            """
+        ),
+        {"table": table},
+    )
+    return [row[0] for row in result.all()]
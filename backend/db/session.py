@@ -7,24 +7,57 @@ from sqlalchemy.ext.asyncio import (
 )
 
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from backend.db.dialect import async_database_url
 
 load_dotenv()
 
 DATABASE_URL = os.getenv("DATABASE_URL")
 
-# IMPORTANT: change postgres → postgresql+asyncpg
-DATABASE_URL = DATABASE_URL.replace(
-    "postgresql://",
-    "postgresql+asyncpg://"
-)
+if not DATABASE_URL:
+    raise RuntimeError("DATABASE_URL is not set (e.g. postgresql://... or sqlite:///:memory:)")
+
+# Global connection budget shared by every worker process. backend/server.py
+# exports WEB_CONCURRENCY so each worker can take its share.
+DB_MAX_CONNECTIONS = int(os.getenv("DB_MAX_CONNECTIONS", "30"))
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", "1"))
+
+
+def pool_budget(max_connections: int, workers: int):
+    # pool_size + max_overflow per worker never exceeds max_connections / workers;
+    # a third stays open, the rest is burst capacity (10 + 20 for one worker)
+    workers = max(workers, 1)
+    if workers > max_connections:
+        # Even one connection each would go over the budget
+        raise RuntimeError(
+            f"WEB_CONCURRENCY={workers} workers need at least {workers} connections, "
+            f"but DB_MAX_CONNECTIONS is {max_connections}"
+        )
+    per_worker = max_connections // workers
+    pool_size = max(per_worker // 3, 1)
+    return pool_size, per_worker - pool_size
+
+
+def engine_options(url):
+    if url.get_backend_name() == "sqlite":
+        # An in-memory database only exists inside one connection, so every
+        # session has to share it
+        if url.database in (None, "", ":memory:"):
+            return {"poolclass": StaticPool, "connect_args": {"check_same_thread": False}}
+        return {}
+
+    pool_size, max_overflow = pool_budget(DB_MAX_CONNECTIONS, WEB_CONCURRENCY)
+    return {"pool_size": pool_size, "max_overflow": max_overflow, "pool_pre_ping": True}
+
+
+DATABASE_URL = async_database_url(DATABASE_URL)
 
 engine = create_async_engine(
 
     DATABASE_URL,
 
-    pool_size=10,
-    max_overflow=20,
-    pool_pre_ping=True
+    **engine_options(DATABASE_URL)
 )
 
 SessionLocal = sessionmaker(
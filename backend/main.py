@@ -1,28 +1,123 @@
+import asyncio
+import logging
+import os
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from backend.db.session import engine
+from sqlalchemy import text
+from backend.db.session import SessionLocal, engine
 from backend.routes import (
     test,
     auth,
     product,
-    cart,order,categories)
+    cart,order,categories,
+    analytics,
+    batch)
 from backend.db.base import Base
+from backend.db.dialect import is_postgres
+from backend.db.partitions import ensure_order_partitions
+from backend.core.compression import CompressionMiddleware
+from backend.crud.carts import sweep_abandoned_carts
+from backend.crud.products import build_autocomplete_index
+from backend.core.idempotency import IdempotencyMiddleware
+from backend.core.profiling import ProfilingMiddleware
 
 
-app = FastAPI()
-
 async def init_db():
     async with engine.begin() as conn:
+        # Every worker runs this on boot; serialize them so create_all doesn't race
+        if is_postgres(conn):
+            await conn.execute(text("SELECT pg_advisory_xact_lock(7263001)"))
+
         # run_sync allows you to run synchronous functions (like create_all) 
         # using the underlying synchronous connection of the async engine
         await conn.run_sync(Base.metadata.create_all)
+        # Partitioned tables need a partition for the current month before any insert
+        await ensure_order_partitions(conn)
+
+logger = logging.getLogger(__name__)
+
+# How often each worker rebuilds its autocomplete index to pick up product
+# writes handled by other workers
+AUTOCOMPLETE_REFRESH_SECONDS = int(os.getenv("AUTOCOMPLETE_REFRESH_SECONDS", "300"))
+# How often each worker deletes abandoned carts; 0 turns the sweeper off
+# (e.g. when it runs from cron via backend.scripts.sweep_carts instead)
+CART_SWEEP_INTERVAL_SECONDS = int(os.getenv("CART_SWEEP_INTERVAL_SECONDS", "3600"))
+# How often each worker makes sure the coming months' order partitions
+# exist, so a worker that stays up for months doesn't run past them
+ORDER_PARTITION_INTERVAL_SECONDS = int(os.getenv("ORDER_PARTITION_INTERVAL_SECONDS", "86400"))
+
+
+async def refresh_autocomplete_index():
+    async with SessionLocal() as db:
+        await build_autocomplete_index(db)
+
+
+async def refresh_autocomplete_periodically():
+    while True:
+        await asyncio.sleep(AUTOCOMPLETE_REFRESH_SECONDS)
+        try:
+            await refresh_autocomplete_index()
+        except Exception:
+            logger.exception("Autocomplete index refresh failed")
+
 
-@app.on_event("startup")
-async def on_startup():
+async def sweep_carts_periodically():
+    while True:
+        await asyncio.sleep(CART_SWEEP_INTERVAL_SECONDS)
+        try:
+            async with SessionLocal() as db:
+                reclaimed = await sweep_abandoned_carts(db)
+            logger.info(
+                "Cart sweep reclaimed %d carts, %d cart items",
+                reclaimed["carts"], reclaimed["cart_items"],
+            )
+        except Exception:
+            logger.exception("Abandoned cart sweep failed")
+
+
+async def ensure_partitions_periodically():
+    while True:
+        await asyncio.sleep(ORDER_PARTITION_INTERVAL_SECONDS)
+        try:
+            async with engine.begin() as conn:
+                await ensure_order_partitions(conn)
+        except Exception:
+            logger.exception("Creating order partitions failed")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
     await init_db()
+    await refresh_autocomplete_index()
+    tasks = [asyncio.create_task(refresh_autocomplete_periodically())]
+    if CART_SWEEP_INTERVAL_SECONDS > 0:
+        tasks.append(asyncio.create_task(sweep_carts_periodically()))
+    if ORDER_PARTITION_INTERVAL_SECONDS > 0:
+        tasks.append(asyncio.create_task(ensure_partitions_periodically()))
+    yield
+    for task in tasks:
+        task.cancel()
+    # Close pooled connections so restarts don't leave them hanging on the server
+    await engine.dispose()
+
+
+app = FastAPI(lifespan=lifespan)
+
+# Opt-in per-request profiles (admin X-Profile: 1 header or PROFILE_SAMPLE_RATE)
+app.add_middleware(ProfilingMiddleware)
+
+# Replays retried POST/PUT/DELETE requests that carry an Idempotency-Key.
+# Added before compression so it stores uncompressed bodies.
+app.add_middleware(IdempotencyMiddleware)
+
+# gzip/brotli for large responses (product listings on slow mobile links)
+app.add_middleware(CompressionMiddleware)
 
 app.include_router(auth.router)
 app.include_router(test.router)
 app.include_router(product.router)
 app.include_router(cart.router)
 app.include_router(order.router)
-app.include_router(categories.router)
\ No newline at end of file
+app.include_router(categories.router)
+app.include_router(analytics.router)
+app.include_router(batch.router)
@@ -1,6 +1,8 @@
 from .user import User
-from .product import Product
+from .product import Product, Category, CategoryProductCount
 from .cart import Cart
 from .cart_item import CartItem
 from .order import Order
 from .order_item import OrderItem
+from .analytics import DailySales, DailyProductSales
+from .recommendation import ProductCooccurrence
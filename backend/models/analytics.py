@@ -0,0 +1,25 @@
+from sqlalchemy import Column, Date, Float, Integer, String, Uuid
+
+from backend.db.base import Base
+
+
+class DailySales(Base):
+    # One row per day, incremented by checkout
+    __tablename__ = "daily_sales"
+
+    day = Column(Date, primary_key=True)
+    order_count = Column(Integer, nullable=False, default=0)
+    items_sold = Column(Integer, nullable=False, default=0)
+    revenue = Column(Float, nullable=False, default=0)
+
+
+class DailyProductSales(Base):
+    # One row per (day, product); category is snapshotted at sale time
+    __tablename__ = "daily_product_sales"
+
+    day = Column(Date, primary_key=True)
+    product_id = Column(Uuid, primary_key=True)
+    product_name = Column(String)
+    category_id = Column(Integer, nullable=True, index=True)
+    quantity = Column(Integer, nullable=False, default=0)
+    revenue = Column(Float, nullable=False, default=0)
@@ -1,6 +1,6 @@
 import uuid
-from sqlalchemy import Column, ForeignKey
-from sqlalchemy.dialects.postgresql import UUID
+from datetime import datetime
+from sqlalchemy import Column, DateTime, ForeignKey, Uuid, func
 from sqlalchemy.orm import relationship
 from backend.db.base import Base
 
@@ -8,7 +8,11 @@ from backend.db.base import Base
 class Cart(Base):
     __tablename__ = "carts"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"),index=True)
+    id = Column(Uuid, primary_key=True, default=uuid.uuid4)
+    user_id = Column(Uuid, ForeignKey("users.id"),index=True)
+    # Bumped on every cart write; the abandoned-cart sweeper scans this index.
+    # The server default covers inserts that don't know the column yet (e.g.
+    # the previous release still running during a rolling deploy).
+    last_active_at = Column(DateTime, nullable=False, default=datetime.utcnow, server_default=func.now(), index=True)
 
     items = relationship("CartItem", back_populates="cart")
@@ -1,6 +1,5 @@
 import uuid
-from sqlalchemy import Column, ForeignKey, Integer
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, ForeignKey, Integer, UniqueConstraint, Uuid
 from sqlalchemy.orm import relationship
 from backend.db.base import Base
 
@@ -8,9 +7,14 @@ from backend.db.base import Base
 class CartItem(Base):
     __tablename__ = "cart_items"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    cart_id = Column(UUID(as_uuid=True), ForeignKey("carts.id"))
-    product_id = Column(UUID(as_uuid=True), ForeignKey("products.id"))
+    # One row per product per cart; lets guest-cart merges upsert in one statement
+    __table_args__ = (
+        UniqueConstraint("cart_id", "product_id", name="uq_cart_items_cart_id_product_id"),
+    )
+
+    id = Column(Uuid, primary_key=True, default=uuid.uuid4)
+    cart_id = Column(Uuid, ForeignKey("carts.id"))
+    product_id = Column(Uuid, ForeignKey("products.id"))
     quantity = Column(Integer, default=1)
 
     cart = relationship("Cart", back_populates="items")
@@ -1,6 +1,5 @@
 import uuid
-from sqlalchemy import Column, ForeignKey, Float, DateTime,String
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, ForeignKey, Float, DateTime, Index, String, Uuid
 from sqlalchemy.orm import relationship
 from datetime import datetime
 
@@ -10,10 +9,18 @@ from backend.db.base import Base
 class Order(Base):
     __tablename__ = "orders"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"),index=True)
+    # Monthly range partitions on created_at (see backend/db/partitions.py);
+    # Postgres requires the partition key to be part of the primary key
+    __table_args__ = (
+        # Admin order list: filter by status, newest first
+        Index("ix_orders_status_created_at", "status", "created_at"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
+
+    id = Column(Uuid, primary_key=True, default=uuid.uuid4)
+    user_id = Column(Uuid, ForeignKey("users.id"),index=True)
     total_amount = Column(Float)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, primary_key=True, default=datetime.utcnow)
     status = Column(String, default="pending")
 
     items = relationship("OrderItem", back_populates="order")
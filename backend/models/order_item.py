@@ -1,6 +1,5 @@
 import uuid
-from sqlalchemy import Column, ForeignKey, Integer, Float, String
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, DateTime, ForeignKeyConstraint, Integer, Float, String, Uuid
 from sqlalchemy.orm import relationship
 
 from backend.db.base import Base
@@ -9,10 +8,21 @@ from backend.db.base import Base
 class OrderItem(Base):
     __tablename__ = "order_items"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    order_id = Column(UUID(as_uuid=True), ForeignKey("orders.id"))
+    # Partitioned on the parent order's created_at so items are co-located
+    # with their order and archived together
+    __table_args__ = (
+        ForeignKeyConstraint(
+            ["order_id", "order_created_at"],
+            ["orders.id", "orders.created_at"],
+        ),
+        {"postgresql_partition_by": "RANGE (order_created_at)"},
+    )
 
-    product_id = Column(UUID(as_uuid=True))
+    id = Column(Uuid, primary_key=True, default=uuid.uuid4)
+    order_id = Column(Uuid, index=True)
+    order_created_at = Column(DateTime, primary_key=True)
+
+    product_id = Column(Uuid)
     product_name = Column(String)
     product_price = Column(Float)
 
@@ -1,6 +1,5 @@
 import uuid
-from sqlalchemy import Column, String, Float, Boolean,Integer,DateTime,ForeignKey,func
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, Float, Boolean,Integer,DateTime,ForeignKey,Index,func, Uuid
 from sqlalchemy.orm import relationship
 from backend.db.base import Base
 
@@ -8,13 +7,21 @@ from backend.db.base import Base
 class Product(Base):
     __tablename__ = "products"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(Uuid, primary_key=True, default=uuid.uuid4)
     name = Column(String, nullable=False,index=True)
     description = Column(String, nullable=True)
     price = Column(Float, nullable=False)
     is_active = Column(Boolean, default=True)
     category_id = Column(Integer, ForeignKey("categories.id"), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
     category = relationship("Category", back_populates="products")
+
+    # Support the listing sorts: category filter + price sort, and price sort alone
+    __table_args__ = (
+        Index("ix_products_category_id_price", "category_id", "price"),
+        Index("ix_products_price", "price"),
+    )
+
 class Category(Base):
     __tablename__ = "categories"
 
@@ -23,4 +30,13 @@ class Category(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     # Relationship to products
-    products = relationship("Product", back_populates="category")
\ No newline at end of file
+    products = relationship("Product", back_populates="category")
+
+
+class CategoryProductCount(Base):
+    # Rollup of active products per category, kept current by the product
+    # routes so listing counts never has to scan the products table
+    __tablename__ = "category_product_counts"
+
+    category_id = Column(Integer, ForeignKey("categories.id", ondelete="CASCADE"), primary_key=True)
+    active_count = Column(Integer, nullable=False, default=0, server_default="0")
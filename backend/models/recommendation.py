@@ -0,0 +1,17 @@
+from sqlalchemy import Column, Index, Integer, Uuid
+
+from backend.db.base import Base
+
+
+class ProductCooccurrence(Base):
+    # How many orders contained both products; stored in both directions so
+    # "related to X" is a single index range scan on product_id
+    __tablename__ = "product_cooccurrence"
+
+    product_id = Column(Uuid, primary_key=True)
+    related_product_id = Column(Uuid, primary_key=True)
+    score = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        Index("ix_product_cooccurrence_product_id_score", "product_id", "score"),
+    )
@@ -0,0 +1,63 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import date, datetime, timedelta
+from typing import List, Literal, Optional, Union
+
+from backend.core.dependencies import get_db, get_current_admin
+from backend.crud.analytics import (
+    get_average_order_value,
+    get_revenue_by_category,
+    get_revenue_by_day,
+    get_top_products,
+)
+from backend.schemas.analytics import AverageOrderValue, CategoryRevenue, DailyRevenue, TopProduct
+
+# All reads here hit the daily rollup tables, never orders/order_items
+router = APIRouter(prefix="/admin/analytics", tags=["Analytics"])
+
+DEFAULT_RANGE_DAYS = 30
+
+
+def resolve_range(start: Optional[date], end: Optional[date]):
+    end = end or datetime.utcnow().date()
+    start = start or end - timedelta(days=DEFAULT_RANGE_DAYS - 1)
+    if start > end:
+        raise HTTPException(400, "start must be on or before end")
+    return start, end
+
+
+@router.get("/revenue", response_model=Union[List[DailyRevenue], List[CategoryRevenue]])
+async def revenue(
+    group_by: Literal["day", "category"] = "day",
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    db: AsyncSession = Depends(get_db),
+    admin=Depends(get_current_admin)
+):
+    start, end = resolve_range(start, end)
+    if group_by == "category":
+        return await get_revenue_by_category(db, start, end)
+    return await get_revenue_by_day(db, start, end)
+
+
+@router.get("/top-products", response_model=List[TopProduct])
+async def top_products(
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    limit: int = 20,
+    db: AsyncSession = Depends(get_db),
+    admin=Depends(get_current_admin)
+):
+    start, end = resolve_range(start, end)
+    return await get_top_products(db, start, end, limit=max(1, min(limit, 100)))
+
+
+@router.get("/average-order-value", response_model=AverageOrderValue)
+async def average_order_value(
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    db: AsyncSession = Depends(get_db),
+    admin=Depends(get_current_admin)
+):
+    start, end = resolve_range(start, end)
+    return await get_average_order_value(db, start, end)
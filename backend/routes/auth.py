@@ -1,10 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from backend.schemas.user import UserResponse
 from sqlalchemy import select
 from backend.models.user import User
 from backend.core.auth import hash_password, verify_password, create_access_token
 from backend.core.dependencies import get_db
+from backend.core.guest_cart import clear_guest_cart, read_guest_cart
+from backend.crud.carts import merge_guest_cart
 from pydantic import BaseModel, EmailStr
 from fastapi.security import OAuth2PasswordRequestForm
 
@@ -46,7 +48,12 @@ async def signup(user_data: UserCreate, db: AsyncSession = Depends(get_db)):
     return new_user
     
 @router.post("/login")
-async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_db)):
+async def login(
+    request: Request,
+    response: Response,
+    form_data: OAuth2PasswordRequestForm = Depends(),
+    db: AsyncSession = Depends(get_db)
+):
     # Async query for user
     result = await db.execute(select(User).where(User.email == form_data.username))
     user = result.scalars().first()
@@ -54,6 +61,12 @@ async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSessi
     if not user or not verify_password(form_data.password, user.hashed_password):
         raise HTTPException(status_code=400, detail="Invalid credentials")
 
+    # Anything added to a guest cart before logging in moves to the real cart
+    guest_items = read_guest_cart(request)
+    if guest_items:
+        await merge_guest_cart(db, user.id, guest_items)
+        clear_guest_cart(response)
+
     access_token = create_access_token({"user_id": str(user.id)})
 
     return {"access_token": access_token, "token_type": "bearer"}
\ No newline at end of file
@@ -0,0 +1,39 @@
+from fastapi import APIRouter, Request, Response
+from sqlalchemy import select
+
+from backend.core.batch import run_batch
+from backend.core.idempotency import request_user_id
+from backend.db.session import SessionLocal
+from backend.models.user import User
+from backend.schemas.batch import BatchRequest, BatchResponse
+
+router = APIRouter(tags=["Batch"])
+
+
+@router.post("/batch", response_model=BatchResponse)
+async def batch(
+    batch_request: BatchRequest,
+    request: Request,
+    response: Response
+):
+    # Resolve the caller once for every sub-request. A missing or bad token
+    # isn't an error here: sub-requests that need auth return their own 401.
+    user = None
+    user_id = request_user_id(request.headers)
+    if user_id is not None:
+        # Short-lived session: the connection goes back to the pool before
+        # the sub-requests each take their own
+        async with SessionLocal() as db:
+            result = await db.execute(select(User).where(User.id == user_id))
+            user = result.scalars().first()
+            if user is not None:
+                # Shared read-only by concurrent sub-requests
+                db.expunge(user)
+
+    results, set_cookies = await run_batch(request.app, request.scope, batch_request.requests, user)
+
+    # e.g. guest cart updates made inside the batch
+    for cookie in set_cookies:
+        response.headers.append("set-cookie", cookie)
+
+    return {"responses": results}
@@ -1,9 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import joinedload, selectinload
 from uuid import UUID
-from backend.schemas.cart import CartResponse
+from backend.crud.carts import get_or_create_cart
+from backend.core.guest_cart import MAX_ITEMS, MAX_QUANTITY, read_guest_cart, write_guest_cart
+from backend.schemas.cart import CartResponse, GuestCartResponse
 from backend.core.dependencies import get_current_user, get_db
 from backend.models.cart import Cart
 from backend.models.cart_item import CartItem
@@ -27,15 +29,8 @@ async def add_to_cart(
     if not product:
         raise HTTPException(status_code=404, detail="Product not found")
 
-    # Get or create cart
-    result = await db.execute(select(Cart).where(Cart.user_id == current_user.id))
-    cart = result.scalars().first()
-
-    if not cart:
-        cart = Cart(user_id=current_user.id)
-        db.add(cart)
-        await db.commit()
-        await db.refresh(cart)
+    # Get or create cart (also marks it active for the abandoned-cart sweeper)
+    cart = await get_or_create_cart(db, current_user.id)
 
     # Check if product already in cart
     result = await db.execute(
@@ -79,4 +74,52 @@ async def view_cart(
 
     # Just return the database object! 
     # FastAPI and your CartResponse schema will do the rest.
-    return cart
\ No newline at end of file
+    return cart
+
+
+@router.post("/guest/add/{product_id}")
+async def add_to_guest_cart(
+    product_id: UUID,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_db)
+):
+    # Anonymous cart: one read to validate the product, the cart itself
+    # lives in a signed cookie so nothing is written to the database
+    result = await db.execute(
+        select(Product.id).where(Product.id == product_id, Product.is_active == True)
+    )
+    if result.scalar_one_or_none() is None:
+        raise HTTPException(status_code=404, detail="Product not found")
+
+    items = read_guest_cart(request)
+    if product_id not in items and len(items) >= MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"Guest carts are limited to {MAX_ITEMS} products")
+
+    items[product_id] = min(items.get(product_id, 0) + 1, MAX_QUANTITY)
+    write_guest_cart(response, items)
+    return {"message": "Product added to cart"}
+
+
+@router.get("/guest", response_model=GuestCartResponse)
+async def view_guest_cart(request: Request, db: AsyncSession = Depends(get_db)):
+    items = read_guest_cart(request)
+    if not items:
+        return {"items": []}
+
+    # One IN query for every product in the cookie
+    result = await db.execute(
+        select(Product)
+        .options(joinedload(Product.category))
+        .where(Product.id.in_(list(items)), Product.is_active == True)
+    )
+    products = {p.id: p for p in result.scalars().all()}
+
+    # Products deleted since they went into the cookie are dropped silently
+    return {
+        "items": [
+            {"product_id": product_id, "quantity": quantity, "product": products[product_id]}
+            for product_id, quantity in items.items()
+            if product_id in products
+        ]
+    }
@@ -4,8 +4,14 @@ from typing import List
 from sqlalchemy.future import select
 
 # Correcting imports based on your structure
-from backend.crud.categories import create_category, get_categories
-from backend.schemas.product import CategoryCreate, CategoryResponse,CategoryUpdate
+from backend.crud.categories import (
+    create_category,
+    delete_category_counts,
+    get_categories,
+    get_category_product_count,
+    with_product_count,
+)
+from backend.schemas.product import CategoryCountResponse, CategoryCreate, CategoryResponse,CategoryUpdate
 from backend.core.dependencies import get_db,get_current_admin
 from backend.models.product import Category 
 
@@ -19,18 +25,20 @@ async def api_create_category(
 ):
     return await create_category(db=db, category=category)
 
-@router.get("/", response_model=List[CategoryResponse])
+@router.get("/", response_model=List[CategoryCountResponse], response_model_exclude_none=True)
 async def api_read_categories(
     skip: int = 0, 
     limit: int = 100, 
+    with_counts: bool = False,
     db: AsyncSession = Depends(get_db)
     # No admin dependency here so customers can see categories
 ):
-    return await get_categories(db=db, skip=skip, limit=limit)
+    return await get_categories(db=db, skip=skip, limit=limit, with_counts=with_counts)
 
-@router.get("/{category_id}", response_model=CategoryResponse)
+@router.get("/{category_id}", response_model=CategoryCountResponse, response_model_exclude_none=True)
 async def api_get_category(
     category_id: int, 
+    with_counts: bool = False,
     db: AsyncSession = Depends(get_db)
 ):
     result = await db.execute(
@@ -40,7 +48,10 @@ async def api_get_category(
     
     if not category:
         raise HTTPException(status_code=404, detail="Category not found")
-        
+
+    if with_counts:
+        return with_product_count(category, await get_category_product_count(db, category_id))
+
     return category
 
 # UPDATE Category
@@ -77,6 +88,7 @@ async def delete_category(
     if not category:
         raise HTTPException(status_code=404, detail="Category not found")
 
+    await delete_category_counts(db, category_id)
     await db.delete(category)
     await db.commit()
     return None
\ No newline at end of file
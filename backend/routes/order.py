@@ -2,13 +2,17 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import selectinload
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from backend.schemas.order import OrderResponse
-from typing import List
+from backend.schemas.order import AdminOrderListResponse, OrderResponse
+from typing import List, Optional
 from uuid import UUID
 
 from datetime import datetime
 
-from backend.core.dependencies import get_db, get_current_user
+from backend.core.dependencies import get_db, get_current_admin, get_current_user
+from backend.crud.analytics import record_order
+from backend.crud.orders import estimate_order_count, list_orders
+from backend.crud.products import autocomplete_index
+from backend.crud.recommendations import record_order_pairs
 from backend.models import CartItem, Order, OrderItem, User, Cart
 
 
@@ -43,6 +47,7 @@ async def checkout(
     await db.flush() # Flushes to get 'order.id' without committing the whole transaction yet
 
     total = 0
+    rollup_lines = []
 
     # 3. Process items
     for item in cart_items:
@@ -53,6 +58,7 @@ async def checkout(
 
         order_item = OrderItem(
             order_id=order.id,
+            order_created_at=order.created_at,
             product_id=product.id,
             product_name=product.name,
             product_price=product.price,
@@ -60,19 +66,67 @@ async def checkout(
             subtotal=subtotal
         )
         db.add(order_item)
-        
+        rollup_lines.append(
+            (product.id, product.name, product.category_id, item.quantity, subtotal)
+        )
+
         # Mark cart item for deletion
         await db.delete(item)
 
-    # 4. Finalize and Commit
+    # 4. Finalize and Commit (the sales rollups commit with the order)
     order.total_amount = total
+    await record_order(db, order.created_at.date(), total, rollup_lines)
+    await record_order_pairs(db, [line[0] for line in rollup_lines])
     await db.commit() 
 
+    # Sales feed the autocomplete popularity weights
+    for product_id, _, _, quantity, _ in rollup_lines:
+        autocomplete_index.bump(product_id, quantity)
+
     return {
         "message": "Order placed successfully",
         "order_id": order.id
     }
 
+@router.get("/", response_model=AdminOrderListResponse)
+async def admin_list_orders(
+    status: Optional[str] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    user_id: Optional[UUID] = None,
+    cursor: Optional[str] = None,
+    limit: int = 50,
+    db: AsyncSession = Depends(get_db),
+    admin=Depends(get_current_admin)
+):
+    # Support dashboard: every user's orders, newest first.
+    # created_from is inclusive, created_to exclusive.
+    filters = {
+        "status": status,
+        "created_from": created_from,
+        "created_to": created_to,
+        "user_id": user_id,
+    }
+
+    try:
+        orders, next_cursor = await list_orders(db, filters, cursor=cursor, limit=max(1, min(limit, 200)))
+    except ValueError:
+        raise HTTPException(400, "Invalid cursor")
+
+    if cursor is None and next_cursor is None:
+        # The whole result fits on this page, so its length is the exact total
+        total, is_estimate = len(orders), False
+    else:
+        total, is_estimate = await estimate_order_count(db, filters)
+
+    return {
+        "orders": orders,
+        "next_cursor": next_cursor,
+        "total": total,
+        "total_is_estimate": is_estimate,
+    }
+
+
 @router.get("/my", response_model=List[OrderResponse])
 async def order_history(
     db: AsyncSession = Depends(get_db),
@@ -2,35 +2,195 @@ from fastapi import APIRouter, Depends, HTTPException
 import uuid
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from sqlalchemy.orm import joinedload
-
+from sqlalchemy.orm import joinedload, load_only
+
+from backend.crud.categories import adjust_category_count
+from backend.crud.recommendations import get_related_products
+from backend.crud.products import (
+    autocomplete_index,
+    bulk_update_products,
+    get_product_facets,
+    invalidate_product_caches,
+    product_flight,
+)
 from backend.models.product import Product
-from backend.schemas.product import ProductCreate, ProductResponse
+from backend.schemas.product import (
+    PRODUCT_FIELDS,
+    ProductBatchRequest,
+    ProductBatchResponse,
+    ProductBulkUpdateRequest,
+    ProductBulkUpdateResponse,
+    ProductCreate,
+    ProductFacetsResponse,
+    ProductPartialResponse,
+    ProductSuggestion,
+    ProductResponse,
+)
 from backend.core.dependencies import get_db, get_current_admin
-from typing import List,Optional
+from typing import List,Literal,Optional
 
 router = APIRouter(prefix="/products", tags=["Products"])
 
+# id is always the last key so pages are stable when the sort column ties
+PRODUCT_SORTS = {
+    "newest": (Product.created_at.desc(), Product.id.desc()),
+    "price_asc": (Product.price.asc(), Product.id.asc()),
+    "price_desc": (Product.price.desc(), Product.id.desc()),
+    "name": (Product.name.asc(), Product.id.asc()),
+}
+
+
+def parse_fields(fields: Optional[str]):
+    # None means "everything", which keeps the old full response
+    if not fields:
+        return None
+
+    requested = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = set(requested) - set(PRODUCT_FIELDS)
+    if unknown:
+        raise HTTPException(400, f"Unknown fields: {', '.join(sorted(unknown))}")
+
+    return requested
+
+
+def product_select(requested, extra_columns=()):
+    # Full rows + category when no fieldset was asked for
+    if requested is None:
+        return select(Product).options(joinedload(Product.category))
+
+    # Only SELECT the columns we are going to send back
+    columns = [
+        getattr(Product, f) for f in requested if f not in ("id", "category")
+    ]
+    loaded = {c.key for c in columns}
+    columns += [c for c in extra_columns if c.key not in loaded]
+    query = select(Product).options(load_only(*columns) if columns else load_only(Product.id))
+
+    if "category" in requested:
+        query = query.options(joinedload(Product.category))
+
+    return query
+
+
+def serialize_product(product, requested):
+    if requested is None:
+        return product
+
+    # Never touch unloaded attributes; that would lazy-load per row
+    return {f: getattr(product, f) for f in requested}
+
 
-@router.get("/", response_model=List[ProductResponse])
+@router.get("/", response_model=List[ProductPartialResponse], response_model_exclude_unset=True)
 async def get_products(
     skip: int = 0,
     limit: int = 10,
     category_id: Optional[int] = None,  # NEW: Optional filter parameter
+    min_price: Optional[float] = None,
+    max_price: Optional[float] = None,
+    sort: Literal["newest", "price_asc", "price_desc", "name"] = "newest",
+    fields: Optional[str] = None,
     db: AsyncSession = Depends(get_db)
 ):
+    requested = parse_fields(fields)
+
     # Start the base query
-    query = select(Product).options(joinedload(Product.category)).where(Product.is_active == True)
+    query = product_select(requested).where(Product.is_active == True)
 
     # NEW: If the user provided a category_id, add a filter to the query
     if category_id:
         query = query.where(Product.category_id == category_id)
 
+    if min_price is not None:
+        query = query.where(Product.price >= min_price)
+    if max_price is not None:
+        query = query.where(Product.price <= max_price)
+
     result = await db.execute(
-        query.offset(skip).limit(limit)
+        query.order_by(*PRODUCT_SORTS[sort]).offset(skip).limit(limit)
     )
 
-    return result.scalars().all()
+    return [serialize_product(p, requested) for p in result.scalars().all()]
+
+
+@router.get("/facets", response_model=ProductFacetsResponse)
+async def get_facets(
+    category_id: Optional[int] = None,
+    min_price: Optional[float] = None,
+    max_price: Optional[float] = None,
+    db: AsyncSession = Depends(get_db)
+):
+    # Cached per worker and cleared on every product write
+    return await get_product_facets(
+        db, category_id=category_id, min_price=min_price, max_price=max_price
+    )
+
+
+@router.get("/autocomplete", response_model=List[ProductSuggestion])
+async def autocomplete(prefix: str, limit: int = 10):
+    # Served entirely from this worker's in-memory index, no DB round trip
+    return autocomplete_index.search(prefix, limit=max(1, min(limit, 20)))
+
+
+@router.get("/stats/coalescing")
+async def get_coalescing_stats(admin=Depends(get_current_admin)):
+    # Per-worker counters for the single-flight layer on GET /products/{id}
+    return product_flight.stats()
+
+
+@router.post("/batch", response_model=ProductBatchResponse, response_model_exclude_unset=True)
+async def get_products_batch(
+    batch: ProductBatchRequest,
+    fields: Optional[str] = None,
+    db: AsyncSession = Depends(get_db)
+):
+    requested = parse_fields(fields)
+
+    # is_active is always needed to tell "inactive" apart from "missing"
+    query = product_select(requested, extra_columns=[Product.is_active])
+
+    # One round trip for the whole list instead of one GET per id
+    unique_ids = list(dict.fromkeys(batch.ids))
+    result = await db.execute(query.where(Product.id.in_(unique_ids)))
+    found = {p.id: p for p in result.scalars().all()}
+
+    products, missing, inactive = [], [], []
+    for product_id in unique_ids:
+        product = found.get(product_id)
+        if product is None:
+            missing.append(product_id)
+        elif not product.is_active:
+            inactive.append(product_id)
+        else:
+            products.append(serialize_product(product, requested))
+
+    return {"products": products, "missing": missing, "inactive": inactive}
+
+
+@router.post("/bulk-update", response_model=ProductBulkUpdateResponse)
+async def bulk_update(
+    changes: ProductBulkUpdateRequest,
+    db: AsyncSession = Depends(get_db),
+    admin=Depends(get_current_admin)
+):
+    # Category repricing / seasonal sales: one statement instead of a PUT per SKU
+    rows = await bulk_update_products(db, changes)
+
+    # One cache flush for the whole batch
+    invalidate_product_caches()
+    if changes.is_active is not None:
+        for row in rows:
+            if row.is_active:
+                autocomplete_index.add(row.id, row.name)
+            else:
+                autocomplete_index.remove(row.id)
+
+    return {
+        "updated": len(rows),
+        "products": [
+            {"id": row.id, "price": row.price, "is_active": row.is_active, "category_id": row.category_id}
+            for row in rows
+        ],
+    }
 
 
 @router.post("/", response_model=ProductResponse)
@@ -43,16 +203,20 @@ async def create_product(
     new_product = Product(**product_data.model_dump())
 
     db.add(new_product)
+    # New products are always active
+    await adjust_category_count(db, new_product.category_id, 1)
 
     await db.commit()
     await db.refresh(new_product)
+    invalidate_product_caches()
+    autocomplete_index.add(new_product.id, new_product.name)
 
     return new_product
 
 
 @router.delete("/{product_id}")
 async def delete_product(
-    product_id: str,
+    product_id: uuid.UUID,
     db: AsyncSession = Depends(get_db),
     admin=Depends(get_current_admin)
 ):
@@ -66,9 +230,14 @@ async def delete_product(
     if not product:
         raise HTTPException(404, "Product not found")
 
+    if product.is_active:
+        await adjust_category_count(db, product.category_id, -1)
+
     product.is_active = False
 
     await db.commit()
+    invalidate_product_caches()
+    autocomplete_index.remove(product.id)
 
     return {"message": "Product deleted"}
 
@@ -103,32 +272,55 @@ async def update_product(
     product.description = product_data.description
     product.price = product_data.price
     
+    # Keep the per-category rollup in step when an active product moves
+    if product.is_active and product.category_id != product_data.category_id:
+        await adjust_category_count(db, product.category_id, -1)
+        await adjust_category_count(db, product_data.category_id, 1)
+
     # Update Category ID (allows setting to an integer or back to None/null)
     product.category_id = product_data.category_id
 
     await db.commit()
     await db.refresh(product)
+    invalidate_product_caches()
+    if product.is_active:
+        autocomplete_index.add(product.id, product.name)
 
     return product
 
 
-@router.get("/{product_id}", response_model=ProductResponse)
+@router.get("/{product_id}", response_model=ProductPartialResponse, response_model_exclude_unset=True)
 async def get_product(
-    product_id: str,
+    product_id: uuid.UUID,
+    fields: Optional[str] = None,
     db: AsyncSession = Depends(get_db)
 ):
-
-    result = await db.execute(
-        select(Product)
-        .where(
-            Product.id == product_id,
-            Product.is_active == True
+    requested = parse_fields(fields)
+
+    async def load():
+        result = await db.execute(
+            product_select(requested)
+            .where(
+                Product.id == product_id,
+                Product.is_active == True
+            )
         )
-    )
+        return result.scalar_one_or_none()
 
-    product = result.scalar_one_or_none()
+    # Identical concurrent lookups in this worker share the first one's query
+    product = await product_flight.do((product_id, tuple(requested or ())), load)
 
     if not product:
         raise HTTPException(404, "Product not found")
 
-    return product
+    return serialize_product(product, requested)
+
+
+@router.get("/{product_id}/related", response_model=List[ProductResponse])
+async def get_related(
+    product_id: uuid.UUID,
+    limit: int = 10,
+    db: AsyncSession = Depends(get_db)
+):
+    # "Frequently bought together", from the precomputed co-occurrence index
+    return await get_related_products(db, product_id, limit=max(1, min(limit, 50)))
@@ -0,0 +1,32 @@
+from pydantic import BaseModel
+from uuid import UUID
+from typing import Optional
+from datetime import date
+
+
+class DailyRevenue(BaseModel):
+    day: date
+    order_count: int
+    items_sold: int
+    revenue: float
+
+
+class CategoryRevenue(BaseModel):
+    category_id: Optional[int] = None
+    quantity: int
+    revenue: float
+
+
+class TopProduct(BaseModel):
+    product_id: UUID
+    product_name: Optional[str] = None
+    quantity: int
+    revenue: float
+
+
+class AverageOrderValue(BaseModel):
+    start: date
+    end: date
+    order_count: int
+    revenue: float
+    average_order_value: float
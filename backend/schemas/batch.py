@@ -0,0 +1,36 @@
+from pydantic import BaseModel, Field, field_validator
+from typing import Any, Dict, List, Literal, Optional
+
+from backend.core.batch import BATCH_MAX_REQUESTS
+
+
+class BatchOperation(BaseModel):
+    method: Literal["GET", "POST", "PUT", "PATCH", "DELETE"] = "GET"
+    # Path plus optional query string, e.g. "/products/?limit=20"
+    path: str
+    body: Optional[Any] = None
+    headers: Optional[Dict[str, str]] = None
+
+    @field_validator("path")
+    @classmethod
+    def check_path(cls, path: str):
+        if not path.startswith("/"):
+            raise ValueError("path must start with /")
+        if path.split("?", 1)[0].rstrip("/") == "/batch":
+            raise ValueError("batches cannot be nested")
+        return path
+
+
+class BatchRequest(BaseModel):
+    requests: List[BatchOperation] = Field(..., min_length=1, max_length=BATCH_MAX_REQUESTS)
+
+
+class BatchResult(BaseModel):
+    status: int
+    headers: Dict[str, str]
+    body: Any = None
+
+
+class BatchResponse(BaseModel):
+    # Same order as the request list
+    responses: List[BatchResult]
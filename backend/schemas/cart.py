@@ -21,4 +21,19 @@ class CartResponse(BaseModel):
     def total(self) -> float:
         return sum(item.product.price * item.quantity for item in self.items)
 
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+class GuestCartItemResponse(BaseModel):
+    product_id: UUID
+    quantity: int
+    product: ProductResponse
+
+
+class GuestCartResponse(BaseModel):
+    # Guest carts live in a cookie, so there is no cart id or user id yet
+    items: List[GuestCartItemResponse]
+
+    @computed_field
+    @property
+    def total(self) -> float:
+        return sum(item.product.price * item.quantity for item in self.items)
@@ -1,6 +1,6 @@
 from pydantic import BaseModel, ConfigDict
 from uuid import UUID
-from typing import List
+from typing import List, Optional
 from datetime import datetime
 
 class OrderItemResponse(BaseModel):
@@ -18,4 +18,23 @@ class OrderResponse(BaseModel):
     created_at: datetime
     items: List[OrderItemResponse]
 
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+
+class AdminOrderSummary(BaseModel):
+    id: UUID
+    user_id: Optional[UUID] = None
+    total_amount: Optional[float] = None
+    status: str
+    created_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class AdminOrderListResponse(BaseModel):
+    orders: List[AdminOrderSummary]
+    # Pass back as ?cursor= for the next page; null on the last page
+    next_cursor: Optional[str] = None
+    # Planner estimate on Postgres (see total_is_estimate), cached for a minute
+    total: int
+    total_is_estimate: bool
@@ -1,7 +1,7 @@
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import BaseModel, Field, ConfigDict, model_validator
 from uuid import UUID
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 class ProductBase(BaseModel):
     name: str = Field(..., min_length=2, max_length=100)
@@ -28,6 +28,11 @@ class CategoryResponse(CategoryBase):
     model_config = ConfigDict(from_attributes=True)
 
 
+class CategoryCountResponse(CategoryResponse):
+    # Only filled in when the client asks for ?with_counts=true
+    product_count: Optional[int] = None
+
+
 class ProductResponse(ProductBase):
     id: UUID
     is_active: bool
@@ -35,4 +40,90 @@ class ProductResponse(ProductBase):
     # NEW: This nests the category details inside the product response
     category: Optional[CategoryResponse] = None 
 
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+# Fields a client may ask for with ?fields=id,name,price
+PRODUCT_FIELDS = ("id", "name", "description", "price", "is_active", "category_id", "category")
+
+
+class ProductPartialResponse(BaseModel):
+    # Every field is optional so a sparse fieldset validates; routes use
+    # response_model_exclude_unset so only the requested keys are sent
+    id: Optional[UUID] = None
+    name: Optional[str] = None
+    description: Optional[str] = None
+    price: Optional[float] = None
+    is_active: Optional[bool] = None
+    category_id: Optional[int] = None
+    category: Optional[CategoryResponse] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ProductBatchRequest(BaseModel):
+    ids: List[UUID] = Field(..., min_length=1, max_length=100)
+
+
+class ProductBatchResponse(BaseModel):
+    # Products come back in the order the ids were requested
+    products: List[ProductPartialResponse]
+    missing: List[UUID]
+    inactive: List[UUID]
+
+
+class CategoryFacet(BaseModel):
+    category_id: Optional[int] = None
+    count: int
+
+
+class PriceBucketFacet(BaseModel):
+    label: str
+    min_price: float
+    max_price: Optional[float] = None
+    count: int
+
+
+class ProductFacetsResponse(BaseModel):
+    total: int
+    categories: List[CategoryFacet]
+    price_buckets: List[PriceBucketFacet]
+
+
+class ProductSuggestion(BaseModel):
+    id: UUID
+    name: str
+
+
+class ProductBulkUpdateRequest(BaseModel):
+    # Filters: a product must match every one that is given
+    category_id: Optional[int] = None
+    ids: Optional[List[UUID]] = Field(None, min_length=1, max_length=1000)
+    min_price: Optional[float] = Field(None, ge=0)
+    max_price: Optional[float] = Field(None, ge=0)
+
+    # Changes: price_percent=-20 is a 20% discount, price_delta=5 adds 5.00
+    price_percent: Optional[float] = Field(None, gt=-100)
+    price_delta: Optional[float] = None
+    is_active: Optional[bool] = None
+
+    @model_validator(mode="after")
+    def check_filters_and_changes(self):
+        if self.category_id is None and self.ids is None and self.min_price is None and self.max_price is None:
+            raise ValueError("At least one filter (category_id, ids, min_price, max_price) is required")
+        if self.price_percent is not None and self.price_delta is not None:
+            raise ValueError("Use either price_percent or price_delta, not both")
+        if self.price_percent is None and self.price_delta is None and self.is_active is None:
+            raise ValueError("Nothing to change")
+        return self
+
+
+class ProductBulkUpdateItem(BaseModel):
+    id: UUID
+    price: float
+    is_active: bool
+    category_id: Optional[int] = None
+
+
+class ProductBulkUpdateResponse(BaseModel):
+    updated: int
+    products: List[ProductBulkUpdateItem]
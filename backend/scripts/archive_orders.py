@@ -0,0 +1,110 @@
+"""
+Export and detach monthly order partitions older than a cutoff.
+
+    python -m backend.scripts.archive_orders --older-than-months 24 --out-dir archive/
+    python -m backend.scripts.archive_orders --older-than-months 24 --out-dir archive/ --drop
+
+Each month is written to <out-dir>/orders_pYYYY_MM.csv.gz and
+<out-dir>/order_items_pYYYY_MM.csv.gz before its partitions are detached
+(and dropped with --drop). A detached order_items table loses its foreign key
+to orders, which no longer holds the rows it pointed at. Rebuild the analytics rollups before archiving if
+they should keep covering that history.
+"""
+import argparse
+import asyncio
+import csv
+import gzip
+import os
+from datetime import datetime
+from sqlalchemy import text
+
+from backend.db.dialect import is_postgres
+from backend.db.partitions import (
+    add_months,
+    list_partitions,
+    month_start,
+    parse_partition_month,
+    partition_name,
+)
+from backend.db.session import engine
+
+
+async def export_partition(conn, table: str, path: str):
+    result = await conn.stream(text(f"SELECT * FROM {table}"))
+    rows = 0
+    with gzip.open(path, "wt", newline="") as fh:
+        writer = csv.writer(fh)
+        writer.writerow(result.keys())
+        async for partition in result.partitions(1000):
+            writer.writerows(partition)
+            rows += len(partition)
+    return rows
+
+
+async def detached_foreign_keys(conn, table: str):
+    # A detached order_items partition keeps its copy of the FK to orders
+    result = await conn.execute(
+        text(
+            "SELECT conname FROM pg_constraint "
+            "WHERE conrelid = CAST(:table AS regclass) AND contype = 'f' "
+            "AND confrelid = CAST('orders' AS regclass)"
+        ),
+        {"table": table},
+    )
+    return result.scalars().all()
+
+
+async def archive_month(month, out_dir: str, drop: bool):
+    names = {table: partition_name(table, month) for table in ("order_items", "orders")}
+    for name in names.values():
+        path = os.path.join(out_dir, f"{name}.csv.gz")
+        async with engine.connect() as conn:
+            rows = await export_partition(conn, name, path)
+        print(f"Exported {rows} rows from {name} to {path}")
+
+    # Both tables in one transaction so a month is never left half-archived.
+    # order_items goes first, and its FK copy has to go before orders can be
+    # detached: Postgres refuses while the detached items still reference it.
+    async with engine.begin() as conn:
+        await conn.execute(text(f"ALTER TABLE order_items DETACH PARTITION {names['order_items']}"))
+        for constraint in await detached_foreign_keys(conn, names["order_items"]):
+            await conn.execute(text(f'ALTER TABLE {names["order_items"]} DROP CONSTRAINT "{constraint}"'))
+        await conn.execute(text(f"ALTER TABLE orders DETACH PARTITION {names['orders']}"))
+        if drop:
+            for name in names.values():
+                await conn.execute(text(f"DROP TABLE {name}"))
+    for name in names.values():
+        print(f"{'Dropped' if drop else 'Detached'} {name}")
+
+
+async def main(older_than_months: int, out_dir: str, drop: bool):
+    if not is_postgres(engine):
+        raise SystemExit("Order partitions only exist on PostgreSQL")
+
+    os.makedirs(out_dir, exist_ok=True)
+    cutoff = add_months(month_start(datetime.utcnow()), -older_than_months)
+
+    async with engine.connect() as conn:
+        names = await list_partitions(conn, "orders")
+
+    months = sorted(
+        month
+        for month in (parse_partition_month("orders", name) for name in names)
+        if month is not None and month < cutoff
+    )
+    if not months:
+        print(f"No partitions older than {cutoff}")
+
+    for month in months:
+        await archive_month(month, out_dir, drop)
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--older-than-months", type=int, default=24)
+    parser.add_argument("--out-dir", default="archive")
+    parser.add_argument("--drop", action="store_true", help="drop partitions after detaching")
+    args = parser.parse_args()
+    asyncio.run(main(args.older_than_months, args.out_dir, args.drop))
@@ -0,0 +1,23 @@
+"""
+Rebuild the daily sales rollups from order history.
+
+    python -m backend.scripts.backfill_analytics --batch-days 7
+"""
+import argparse
+import asyncio
+
+from backend.crud.analytics import rebuild_rollups
+from backend.db.session import SessionLocal, engine
+
+
+async def main(batch_days: int):
+    async with SessionLocal() as db:
+        await rebuild_rollups(db, batch_days=batch_days)
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--batch-days", type=int, default=7, help="days rebuilt per transaction")
+    args = parser.parse_args()
+    asyncio.run(main(args.batch_days))
@@ -0,0 +1,26 @@
+"""
+Rebuild the "frequently bought together" index from order history.
+
+    python -m backend.scripts.build_cooccurrence --keep 50
+
+Checkout keeps the index current between rebuilds; run this nightly (or after
+archiving old orders) to re-trim every product to its top --keep neighbours.
+"""
+import argparse
+import asyncio
+
+from backend.crud.recommendations import COOCCURRENCE_KEEP, rebuild_cooccurrence
+from backend.db.session import SessionLocal, engine
+
+
+async def main(keep: int):
+    async with SessionLocal() as db:
+        await rebuild_cooccurrence(db, keep=keep)
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--keep", type=int, default=COOCCURRENCE_KEEP, help="related products kept per product")
+    args = parser.parse_args()
+    asyncio.run(main(args.keep))
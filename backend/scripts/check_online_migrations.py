@@ -0,0 +1,144 @@
+"""
+Run Alembic migrations while writers hammer products, carts and orders.
+
+    python -m backend.scripts.check_online_migrations --downgrade-to e2a84c5f1b67
+    python -m backend.scripts.check_online_migrations --writers 8 --max-stall-ms 500
+
+Optionally steps the schema back to --downgrade-to first, then starts the
+writers and runs `alembic upgrade <--upgrade-to>` with ONLINE_MIGRATIONS=1.
+Exits non-zero if the migration fails, any write errors, or one write takes
+longer than --max-stall-ms (i.e. it queued behind a migration lock). Needs a
+disposable Postgres database; rows it writes are removed afterwards.
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime
+from sqlalchemy import delete, insert, text, update
+
+from backend.db.dialect import is_postgres
+from backend.db.session import engine
+from backend.models import Cart, Order, Product
+
+MARKER = "online-migration-check"
+ALEMBIC_INI = os.path.join(os.path.dirname(os.path.dirname(__file__)), "alembic.ini")
+
+
+async def alembic(*args):
+    process = await asyncio.create_subprocess_exec(
+        sys.executable, "-m", "alembic", "-c", ALEMBIC_INI, *args,
+        env={**os.environ, "ONLINE_MIGRATIONS": "1"},
+    )
+    return await process.wait()
+
+
+async def writer(stop: asyncio.Event, stats: dict, product_ids: list, order_ids: list, cart_ids: list):
+    # One small transaction per write, like request traffic
+    while not stop.is_set():
+        started = time.perf_counter()
+        try:
+            async with engine.begin() as conn:
+                action = random.random()
+                if action < 0.4 or not product_ids:
+                    product_id = uuid.uuid4()
+                    await conn.execute(insert(Product).values(
+                        id=product_id, name=f"{MARKER} {product_id.hex[:8]}", price=10.0, is_active=True,
+                    ))
+                    product_ids.append(product_id)
+                elif action < 0.7:
+                    await conn.execute(
+                        update(Product)
+                        .where(Product.id == random.choice(product_ids))
+                        .values(price=round(random.uniform(5, 50), 2))
+                    )
+                elif action < 0.85:
+                    order_id = uuid.uuid4()
+                    await conn.execute(insert(Order).values(
+                        id=order_id, total_amount=10.0, created_at=datetime.utcnow(), status=MARKER,
+                    ))
+                    order_ids.append(order_id)
+                else:
+                    cart_id = uuid.uuid4()
+                    # Only columns every revision has: insert(Cart) would add
+                    # last_active_at, which doesn't exist below a9e4c7b2d158
+                    await conn.execute(
+                        text("INSERT INTO carts (id, user_id) VALUES (:id, NULL)"), {"id": cart_id}
+                    )
+                    cart_ids.append(cart_id)
+            stats["latencies"].append(time.perf_counter() - started)
+        except Exception as exc:
+            stats["errors"].append(repr(exc))
+        await asyncio.sleep(0.005)
+
+
+async def cleanup(product_ids, order_ids, cart_ids):
+    async with engine.begin() as conn:
+        if order_ids:
+            await conn.execute(delete(Order).where(Order.status == MARKER))
+        if product_ids:
+            await conn.execute(delete(Product).where(Product.id.in_(product_ids)))
+        if cart_ids:
+            await conn.execute(delete(Cart).where(Cart.id.in_(cart_ids)))
+
+
+async def main(downgrade_to, upgrade_to: str, writers: int, max_stall_ms: float):
+    async with engine.connect() as conn:
+        if not is_postgres(conn):
+            print("Online migration checks need Postgres; DATABASE_URL points elsewhere")
+            return 2
+
+    if downgrade_to and await alembic("downgrade", downgrade_to) != 0:
+        print(f"Downgrade to {downgrade_to} failed")
+        return 1
+
+    stop = asyncio.Event()
+    stats = {"latencies": [], "errors": []}
+    product_ids, order_ids, cart_ids = [], [], []
+    tasks = [
+        asyncio.create_task(writer(stop, stats, product_ids, order_ids, cart_ids))
+        for _ in range(writers)
+    ]
+
+    # Let the writers warm up so the migration starts under load
+    await asyncio.sleep(1)
+    started = time.perf_counter()
+    status = await alembic("upgrade", upgrade_to)
+    elapsed = time.perf_counter() - started
+    await asyncio.sleep(1)
+
+    stop.set()
+    await asyncio.gather(*tasks)
+    await cleanup(product_ids, order_ids, cart_ids)
+    await engine.dispose()
+
+    latencies = sorted(stats["latencies"])
+    worst_ms = latencies[-1] * 1000 if latencies else 0
+    print(f"migration: {'ok' if status == 0 else f'failed ({status})'} in {elapsed:.1f}s")
+    print(f"writes: {len(latencies)}, errors: {len(stats['errors'])}")
+    if latencies:
+        p99 = latencies[min(int(len(latencies) * 0.99), len(latencies) - 1)]
+        print(f"write latency p50 {statistics.median(latencies) * 1000:.1f}ms "
+              f"p99 {p99 * 1000:.1f}ms max {worst_ms:.1f}ms")
+    for error in stats["errors"][:5]:
+        print(f"  {error}")
+
+    if status != 0 or stats["errors"] or worst_ms > max_stall_ms:
+        print("FAILED: migrations blocked or broke concurrent writes")
+        return 1
+    print("OK: writes kept flowing during the migration")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--downgrade-to", help="revision to step back to before starting")
+    parser.add_argument("--upgrade-to", default="head")
+    parser.add_argument("--writers", type=int, default=4, help="concurrent writer tasks")
+    parser.add_argument("--max-stall-ms", type=float, default=2000, help="slowest write allowed")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main(args.downgrade_to, args.upgrade_to, args.writers, args.max_stall_ms)))
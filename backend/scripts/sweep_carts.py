@@ -0,0 +1,29 @@
+"""
+Delete carts that have been idle for longer than a TTL.
+
+    python -m backend.scripts.sweep_carts --ttl-days 30 --batch-size 500
+
+API workers already do this every CART_SWEEP_INTERVAL_SECONDS; use this to
+run it from cron instead (set CART_SWEEP_INTERVAL_SECONDS=0) or to reclaim
+a backlog once by hand.
+"""
+import argparse
+import asyncio
+
+from backend.crud.carts import CART_SWEEP_BATCH_SIZE, CART_TTL_DAYS, sweep_abandoned_carts
+from backend.db.session import SessionLocal, engine
+
+
+async def main(ttl_days: int, batch_size: int):
+    async with SessionLocal() as db:
+        reclaimed = await sweep_abandoned_carts(db, ttl_days=ttl_days, batch_size=batch_size)
+    print(f"Reclaimed {reclaimed['carts']} carts and {reclaimed['cart_items']} cart items")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--ttl-days", type=int, default=CART_TTL_DAYS, help="delete carts idle longer than this")
+    parser.add_argument("--batch-size", type=int, default=CART_SWEEP_BATCH_SIZE, help="carts deleted per transaction")
+    args = parser.parse_args()
+    asyncio.run(main(args.ttl_days, args.batch_size))
@@ -0,0 +1,50 @@
+"""
+Production entry point: N uvicorn workers on uvloop + httptools.
+
+    python -m backend.server
+
+Send SIGHUP to the master process to restart workers gracefully (e.g. after
+a deploy); in-flight requests get TIMEOUT_GRACEFUL_SHUTDOWN seconds to finish.
+"""
+import os
+import uvicorn
+
+
+def default_workers():
+    # Respect CPU pinning/cgroup affinity inside containers where available
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def main():
+    # Every worker needs at least one connection of the shared budget
+    max_connections = int(os.getenv("DB_MAX_CONNECTIONS", "30"))
+    if "WEB_CONCURRENCY" in os.environ:
+        workers = int(os.environ["WEB_CONCURRENCY"])
+        if workers > max_connections:
+            raise SystemExit(
+                f"WEB_CONCURRENCY={workers} is more workers than DB_MAX_CONNECTIONS={max_connections} "
+                "connections; lower one or raise the other"
+            )
+    else:
+        workers = min(default_workers(), max_connections)
+
+    # Workers inherit the environment; backend/db/session.py divides
+    # DB_MAX_CONNECTIONS by this to size each worker's pool
+    os.environ["WEB_CONCURRENCY"] = str(workers)
+
+    uvicorn.run(
+        "backend.main:app",
+        host=os.getenv("HOST", "0.0.0.0"),
+        port=int(os.getenv("PORT", "8000")),
+        workers=workers,
+        loop="uvloop",
+        http="httptools",
+        proxy_headers=True,
+        timeout_graceful_shutdown=int(os.getenv("TIMEOUT_GRACEFUL_SHUTDOWN", "30")),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+import os
+import uuid
+
+# The suite runs the real app on an in-memory SQLite database; set before
+# anything imports backend.db.session
+os.environ["DATABASE_URL"] = "sqlite+aiosqlite:///:memory:"
+os.environ["CART_SWEEP_INTERVAL_SECONDS"] = "0"
+
+import httpx
+import pytest
+
+from backend.core.auth import create_access_token, hash_password
+from backend.db.session import SessionLocal
+from backend.main import app as fastapi_app
+from backend.models import Product, User
+
+
+@pytest.fixture(scope="session")
+async def app():
+    async with fastapi_app.router.lifespan_context(fastapi_app):
+        yield fastapi_app
+
+
+@pytest.fixture(scope="session")
+async def client(app):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+
+
+@pytest.fixture
+async def db(app):
+    async with SessionLocal() as session:
+        yield session
+
+
+async def create_user(is_admin: bool = False):
+    async with SessionLocal() as session:
+        user = User(email=f"user-{uuid.uuid4().hex[:8]}@example.com",
+                    hashed_password=hash_password("testpass123"), is_admin=is_admin)
+        session.add(user)
+        await session.commit()
+        return user
+
+
+def auth_headers(user):
+    return {"Authorization": f"Bearer {create_access_token({'user_id': str(user.id)})}"}
+
+
+@pytest.fixture
+async def user_headers(app):
+    return auth_headers(await create_user())
+
+
+@pytest.fixture
+async def admin_headers(app):
+    return auth_headers(await create_user(is_admin=True))
+
+
+@pytest.fixture
+async def product(app):
+    async with SessionLocal() as session:
+        product = Product(name=f"Test Shoe {uuid.uuid4().hex[:6]}", price=20.0, is_active=True)
+        session.add(product)
+        await session.commit()
+        return product
@@ -0,0 +1,32 @@
+from backend.crud.analytics import rebuild_rollups
+
+
+async def test_rebuild_matches_incremental_rollups(client, db, user_headers, admin_headers, product):
+    await client.post(f"/cart/add/{product.id}", headers=user_headers)
+    assert (await client.post("/orders/checkout", headers=user_headers)).status_code == 200
+
+    # Checkout maintains the rollups incrementally; a full rebuild must agree
+    before = (await client.get("/admin/analytics/revenue", headers=admin_headers)).json()
+    top_before = (await client.get("/admin/analytics/top-products", headers=admin_headers)).json()
+    assert before
+
+    await rebuild_rollups(db, log=lambda message: None)
+
+    after = (await client.get("/admin/analytics/revenue", headers=admin_headers)).json()
+    top_after = (await client.get("/admin/analytics/top-products", headers=admin_headers)).json()
+    assert after == before
+    assert top_after == top_before
+
+
+async def test_top_products_limit_is_clamped(client, admin_headers, user_headers, product):
+    await client.post(f"/cart/add/{product.id}", headers=user_headers)
+    assert (await client.post("/orders/checkout", headers=user_headers)).status_code == 200
+
+    for limit in (-5, 0):
+        response = await client.get("/admin/analytics/top-products", params={"limit": limit}, headers=admin_headers)
+        assert response.status_code == 200
+        assert len(response.json()) == 1
+
+    response = await client.get("/admin/analytics/top-products", params={"limit": 10**6}, headers=admin_headers)
+    assert response.status_code == 200
+    assert len(response.json()) <= 100
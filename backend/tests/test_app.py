@@ -0,0 +1,29 @@
+async def test_lists_products(client, product):
+    response = await client.get("/products/")
+    assert response.status_code == 200
+    assert str(product.id) in [p["id"] for p in response.json()]
+
+
+async def test_signup_and_login(client):
+    credentials = {"email": "signup@example.com", "password": "testpass123"}
+    assert (await client.post("/signup", json=credentials)).status_code == 200
+
+    response = await client.post("/login", data={"username": credentials["email"], "password": credentials["password"]})
+    assert response.status_code == 200
+    assert response.json()["token_type"] == "bearer"
+
+
+async def test_cart_to_checkout(client, user_headers, product):
+    for _ in range(2):
+        response = await client.post(f"/cart/add/{product.id}", headers=user_headers)
+        assert response.status_code == 200
+
+    cart = (await client.get("/cart/", headers=user_headers)).json()
+    assert cart["items"][0]["quantity"] == 2
+    assert cart["total"] == 40.0
+
+    response = await client.post("/orders/checkout", headers=user_headers)
+    assert response.status_code == 200
+
+    orders = (await client.get("/orders/my", headers=user_headers)).json()
+    assert [o["total_amount"] for o in orders] == [40.0]
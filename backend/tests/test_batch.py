@@ -0,0 +1,36 @@
+async def test_batch_runs_sub_requests_with_one_auth(client, user_headers, product):
+    response = await client.post("/batch", headers=user_headers, json={"requests": [
+        {"path": "/me"},
+        {"path": f"/products/{product.id}?fields=id,name"},
+        {"method": "POST", "path": f"/cart/add/{product.id}"},
+        {"path": "/cart/"},
+    ]})
+    assert response.status_code == 200
+
+    me, found, added, cart = response.json()["responses"]
+    assert me["status"] == 200 and "@example.com" in me["body"]["email"]
+    assert found["body"] == {"id": str(product.id), "name": product.name}
+    assert added["status"] == 200
+    # The GET after the POST sees its write
+    assert cart["body"]["items"][0]["product_id"] == str(product.id)
+
+
+async def test_failing_sub_request_does_not_fail_the_batch(app, client, product):
+    async def boom():
+        raise RuntimeError("boom")
+
+    app.add_api_route("/tests/boom", boom)
+
+    response = await client.post("/batch", json={"requests": [
+        {"path": "/tests/boom"},
+        {"path": f"/products/{product.id}"},
+    ]})
+    assert response.status_code == 200
+    failed, ok = response.json()["responses"]
+    assert failed["status"] == 500
+    assert ok["status"] == 200
+
+
+async def test_nested_batches_are_rejected(client):
+    response = await client.post("/batch", json={"requests": [{"method": "POST", "path": "/batch"}]})
+    assert response.status_code == 422
@@ -0,0 +1,97 @@
+import uuid
+
+import pytest
+
+from backend.crud.categories import refresh_category_counts
+from backend.crud.products import autocomplete_index
+from backend.db.session import SessionLocal
+from backend.models import Product
+
+
+async def create_category(client, admin_headers, prices):
+    # A fresh category per test; the API creates its counts row
+    response = await client.post("/categories/", json={"name": f"Bulk {uuid.uuid4().hex[:8]}"}, headers=admin_headers)
+    category_id = response.json()["id"]
+    async with SessionLocal() as session:
+        products = [
+            Product(name=f"Bulk item {uuid.uuid4().hex[:8]}", price=price, category_id=category_id, is_active=True)
+            for price in prices
+        ]
+        session.add_all(products)
+        await session.flush()
+        await refresh_category_counts(session, [category_id])
+        await session.commit()
+    for product in products:
+        autocomplete_index.add(product.id, product.name)
+    return category_id, [{"id": str(p.id), "name": p.name} for p in products]
+
+
+async def bulk_update(client, admin_headers, **changes):
+    return await client.post("/products/bulk-update", json=changes, headers=admin_headers)
+
+
+async def test_percent_change_rounds_to_cents(client, admin_headers):
+    category_id, _ = await create_category(client, admin_headers, [9.99, 10.0])
+
+    response = await bulk_update(client, admin_headers, category_id=category_id, price_percent=-15)
+    assert response.status_code == 200
+    assert response.json()["updated"] == 2
+    assert sorted(p["price"] for p in response.json()["products"]) == [8.49, 8.5]
+
+
+async def test_prices_that_would_drop_to_zero_are_skipped(client, admin_headers):
+    category_id, products = await create_category(client, admin_headers, [9.99, 10.0, 25.0])
+
+    response = await bulk_update(client, admin_headers, category_id=category_id, price_delta=-10)
+    assert response.json()["updated"] == 1
+    assert response.json()["products"][0]["price"] == 15.0
+
+    cheap = (await client.get(f"/products/{products[0]['id']}")).json()
+    assert cheap["price"] == 9.99
+
+
+async def test_deactivation_updates_counts_and_autocomplete(client, admin_headers):
+    category_id, products = await create_category(client, admin_headers, [5.0, 6.0])
+    name = products[0]["name"]
+
+    async def active_count():
+        response = await client.get(f"/categories/{category_id}", params={"with_counts": True})
+        return response.json()["product_count"]
+
+    async def suggested():
+        response = await client.get("/products/autocomplete", params={"prefix": name})
+        return [s["id"] for s in response.json()]
+
+    assert await active_count() == 2
+    assert await suggested() == [products[0]["id"]]
+
+    response = await bulk_update(client, admin_headers, ids=[products[0]["id"]], is_active=False)
+    assert response.json()["products"][0]["is_active"] is False
+    assert await active_count() == 1
+    assert await suggested() == []
+
+    await bulk_update(client, admin_headers, category_id=category_id, is_active=True)
+    assert await active_count() == 2
+    assert await suggested() == [products[0]["id"]]
+
+
+@pytest.mark.parametrize(
+    "changes",
+    [
+        {"price_percent": 10},
+        {"category_id": 1, "price_percent": 10, "price_delta": 1},
+        {"category_id": 1},
+        {"category_id": 1, "price_percent": -100},
+        {"ids": [], "is_active": False},
+    ],
+)
+async def test_invalid_requests_are_rejected(client, admin_headers, changes):
+    response = await bulk_update(client, admin_headers, **changes)
+    assert response.status_code == 422
+
+
+async def test_requires_an_admin(client, user_headers):
+    response = await client.post(
+        "/products/bulk-update", json={"category_id": 1, "is_active": False}, headers=user_headers
+    )
+    assert response.status_code == 403
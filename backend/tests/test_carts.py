@@ -0,0 +1,49 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import select, update
+
+from backend.crud.carts import sweep_abandoned_carts
+from backend.models import Cart, CartItem
+
+
+async def create_cart(db, product, idle_days):
+    cart = Cart(last_active_at=datetime.utcnow() - timedelta(days=idle_days))
+    db.add(cart)
+    await db.flush()
+    db.add(CartItem(cart_id=cart.id, product_id=product.id, quantity=1))
+    await db.commit()
+    return cart.id
+
+
+async def remaining(db, cart_ids):
+    result = await db.execute(select(Cart.id).where(Cart.id.in_(cart_ids)))
+    return set(result.scalars().all())
+
+
+async def test_sweep_deletes_only_idle_carts(db, product):
+    idle = await create_cart(db, product, idle_days=40)
+    active = await create_cart(db, product, idle_days=1)
+
+    reclaimed = await sweep_abandoned_carts(db, ttl_days=30)
+    assert reclaimed["carts"] >= 1
+    assert await remaining(db, [idle, active]) == {active}
+
+
+async def test_cart_touched_after_the_batch_is_selected_is_kept(db, product):
+    touched = await create_cart(db, product, idle_days=40)
+    execute = db.execute
+
+    async def touch_after_select(statement, *args, **kwargs):
+        result = await execute(statement, *args, **kwargs)
+        if statement.is_select:
+            # add_to_cart landing between the select and the deletes
+            await execute(update(Cart).where(Cart.id == touched).values(last_active_at=datetime.utcnow()))
+        return result
+
+    db.execute = touch_after_select
+    await sweep_abandoned_carts(db, ttl_days=30)
+    del db.execute
+
+    assert await remaining(db, [touched]) == {touched}
+    items = await db.execute(select(CartItem.id).where(CartItem.cart_id == touched))
+    assert len(items.all()) == 1
@@ -0,0 +1,89 @@
+import uuid
+
+from sqlalchemy import select
+
+from backend.core.guest_cart import COOKIE_NAME, decode_guest_cart, encode_guest_cart
+from backend.crud.carts import merge_guest_cart
+from backend.db.session import SessionLocal
+from backend.models import Cart, CartItem, Product
+from backend.tests.conftest import auth_headers, create_user
+
+
+def test_cookie_round_trips():
+    items = {uuid.uuid4(): 3, uuid.uuid4(): 255}
+    assert decode_guest_cart(encode_guest_cart(items)) == items
+
+
+def test_tampered_or_truncated_cookies_read_as_empty():
+    product_id = uuid.uuid4()
+    value = encode_guest_cart({product_id: 1})
+    payload, signature = value.split(".")
+    # Same length, one character changed, so the payload still decodes
+    forged = ("A" if payload[0] != "A" else "B") + payload[1:]
+
+    for bad in (
+        f"{forged}.{signature}",
+        f"{payload}.{signature[:-2]}",
+        value[:-5],
+        payload[:-4] + "." + signature,
+        payload,
+        "not a cookie",
+        "...",
+        "",
+        None,
+    ):
+        assert decode_guest_cart(bad) == {}, bad
+
+
+async def test_tampered_cookie_is_ignored_by_the_api(client, product):
+    value = encode_guest_cart({product.id: 2})
+    response = await client.get("/cart/guest", headers={"Cookie": f"{COOKIE_NAME}={value}"})
+    assert [item["quantity"] for item in response.json()["items"]] == [2]
+
+    response = await client.get("/cart/guest", headers={"Cookie": f"{COOKIE_NAME}={value[:-3]}x"})
+    assert response.json()["items"] == []
+
+
+async def test_login_merges_into_the_existing_cart(client, product):
+    user = await create_user()
+    async with SessionLocal() as session:
+        other = Product(name="Guest laces", price=2.0, is_active=True)
+        session.add(other)
+        await session.commit()
+
+    for _ in range(2):
+        await client.post(f"/cart/add/{product.id}", headers=auth_headers(user))
+
+    cookie = encode_guest_cart({product.id: 3, other.id: 1})
+    try:
+        response = await client.post(
+            "/login",
+            data={"username": user.email, "password": "testpass123"},
+            headers={"Cookie": f"{COOKIE_NAME}={cookie}"},
+        )
+        assert response.status_code == 200
+        # The guest cookie is cleared once it has been merged
+        assert f"{COOKIE_NAME}=" in response.headers["set-cookie"]
+    finally:
+        client.cookies.clear()
+
+    cart = (await client.get("/cart/", headers=auth_headers(user))).json()
+    quantities = {item["product_id"]: item["quantity"] for item in cart["items"]}
+    assert quantities == {str(product.id): 5, str(other.id): 1}
+
+
+async def test_merge_adds_on_the_cart_and_product_key(db, product):
+    user = await create_user()
+    async with SessionLocal() as session:
+        gone = Product(name="Retired item", price=1.0, is_active=False)
+        session.add(gone)
+        await session.commit()
+
+    assert await merge_guest_cart(db, user.id, {product.id: 1, gone.id: 4}) == 1
+    assert await merge_guest_cart(db, user.id, {product.id: 2}) == 1
+    assert await merge_guest_cart(db, user.id, {}) == 0
+
+    result = await db.execute(
+        select(CartItem.product_id, CartItem.quantity).join(Cart).where(Cart.user_id == user.id)
+    )
+    assert result.all() == [(product.id, 3)]
@@ -0,0 +1,70 @@
+import asyncio
+import hashlib
+import uuid
+
+import httpx
+from fastapi import FastAPI
+
+from backend.core.auth import create_access_token
+from backend.core.idempotency import IdempotencyMiddleware, MemoryIdempotencyStore
+
+
+def counting_app(store):
+    app = FastAPI()
+    calls = []
+
+    @app.post("/charge")
+    async def charge():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return {"charge": len(calls)}
+
+    app.add_middleware(IdempotencyMiddleware, store=store)
+    return app, calls
+
+
+def headers(key):
+    token = create_access_token({"user_id": str(uuid.uuid4())})
+    return {"Authorization": f"Bearer {token}", "Idempotency-Key": key}
+
+
+async def post(app, request_headers):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        return await client.post("/charge", headers=request_headers)
+
+
+async def test_retries_replay_the_first_response():
+    app, calls = counting_app(MemoryIdempotencyStore())
+    request_headers = headers("retry-1")
+
+    first, second = await asyncio.gather(post(app, request_headers), post(app, request_headers))
+    third = await post(app, request_headers)
+
+    assert len(calls) == 1
+    assert first.json() == second.json() == third.json() == {"charge": 1}
+    assert third.headers["idempotent-replayed"] == "true"
+
+
+class CompletesDuringBegin(MemoryIdempotencyStore):
+    # Another worker finishes the same key between our get() and begin(),
+    # as can happen with the shared redis store
+    async def begin(self, key):
+        await self.complete(key, {"fingerprint": self.fingerprint, "status": 200,
+                                  "headers": [("content-type", "application/json")],
+                                  "body": b'{"charge":1}'})
+        return await super().begin(key)
+
+
+async def test_completion_between_get_and_begin_is_replayed():
+    store = CompletesDuringBegin()
+    app, calls = counting_app(store)
+    request_headers = headers("race-1")
+
+    # Fingerprint of an empty-body POST /charge
+    store.fingerprint = hashlib.sha256(b"\n".join([b"POST", b"/charge", b"", b""])).hexdigest()
+
+    response = await post(app, request_headers)
+    assert calls == []
+    assert response.json() == {"charge": 1}
+    assert response.headers["idempotent-replayed"] == "true"
@@ -0,0 +1,40 @@
+import uuid
+from datetime import datetime, timedelta
+
+from backend.models import Order
+
+
+async def test_admin_order_list_pages_with_keyset_cursor(client, db, admin_headers):
+    status = f"test-{uuid.uuid4().hex[:6]}"
+    start = datetime(2026, 10, 1, 12, 0)
+    ids = []
+    for n in range(5):
+        order = Order(id=uuid.uuid4(), total_amount=10.0 + n, created_at=start + timedelta(hours=n), status=status)
+        db.add(order)
+        ids.append(str(order.id))
+    await db.commit()
+
+    seen, cursor = [], None
+    while True:
+        params = {"status": status, "limit": 2, **({"cursor": cursor} if cursor else {})}
+        page = (await client.get("/orders/", params=params, headers=admin_headers)).json()
+        seen += [o["id"] for o in page["orders"]]
+        assert page["total"] == 5 and page["total_is_estimate"] is False
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    # Newest first, nothing skipped or repeated across pages
+    assert seen == ids[::-1]
+
+    # Single page: the total is just the page length
+    params = {"status": status, "created_from": (start + timedelta(hours=3)).isoformat()}
+    page = (await client.get("/orders/", params=params, headers=admin_headers)).json()
+    assert [o["id"] for o in page["orders"]] == ids[:2:-1]
+    assert page["total"] == 2 and page["next_cursor"] is None
+
+
+async def test_admin_order_list_rejects_bad_cursor(client, admin_headers, user_headers):
+    response = await client.get("/orders/", params={"cursor": "nope"}, headers=admin_headers)
+    assert response.status_code == 400
+    assert (await client.get("/orders/", headers=user_headers)).status_code == 403
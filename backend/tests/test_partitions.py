@@ -0,0 +1,152 @@
+import os
+import subprocess
+import sys
+import textwrap
+from datetime import date
+
+import pytest
+
+# Runs against the same scratch Postgres database as the online migration check
+DATABASE_URL = os.getenv("ONLINE_MIGRATIONS_TEST_URL")
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytestmark = pytest.mark.skipif(not DATABASE_URL, reason="ONLINE_MIGRATIONS_TEST_URL is not set")
+
+SCRIPT = textwrap.dedent(
+    """
+    import asyncio, uuid
+    from datetime import datetime
+    from sqlalchemy import text
+    from backend.db.partitions import add_months, ensure_order_partitions, month_start, partition_name
+    from backend.db.session import engine
+    from backend.main import init_db
+
+    async def main():
+        await init_db()
+        month = add_months(month_start(datetime.utcnow()), 2)
+        order_id, created_at = uuid.uuid4(), datetime(month.year, month.month, 15)
+        async with engine.begin() as conn:
+            for table in ("order_items", "orders"):
+                await conn.execute(text(f"ALTER TABLE {table} DETACH PARTITION {partition_name(table, month)}"))
+                await conn.execute(text(f"DROP TABLE {partition_name(table, month)}"))
+            # As if the worker had been up since before this month was created
+            await conn.execute(
+                text("INSERT INTO orders (id, total_amount, created_at, status) VALUES (:id, 1, :at, 'pending')"),
+                {"id": order_id, "at": created_at},
+            )
+            await conn.execute(
+                text("INSERT INTO order_items (id, order_id, order_created_at, quantity) VALUES (:id, :order, :at, 1)"),
+                {"id": uuid.uuid4(), "order": order_id, "at": created_at},
+            )
+        async with engine.begin() as conn:
+            await ensure_order_partitions(conn)
+        async with engine.begin() as conn:
+            for table, key in (("orders", "id"), ("order_items", "order_id")):
+                where = f"WHERE {key} = :id"
+                assert (await conn.execute(text(f"SELECT count(*) FROM {partition_name(table, month)} {where}"), {"id": order_id})).scalar() == 1
+                assert (await conn.execute(text(f"SELECT count(*) FROM {table}_default {where}"), {"id": order_id})).scalar() == 0
+            await conn.execute(text("DELETE FROM order_items WHERE order_id = :id"), {"id": order_id})
+            await conn.execute(text("DELETE FROM orders WHERE id = :id"), {"id": order_id})
+        await engine.dispose()
+        print("moved")
+
+    asyncio.run(main())
+    """
+)
+
+
+ARCHIVE_SETUP = textwrap.dedent(
+    """
+    import asyncio, uuid
+    from datetime import date
+    from sqlalchemy import text
+    from backend.db.partitions import create_partition_sql
+    from backend.db.session import engine
+    from backend.main import init_db
+
+    async def main():
+        await init_db()
+        month, order_id = date(2001, 1, 1), uuid.uuid4()
+        async with engine.begin() as conn:
+            for table in ("order_items", "orders"):
+                await conn.execute(text(f"DROP TABLE IF EXISTS {table}_p2001_01"))
+            for table in ("orders", "order_items"):
+                await conn.execute(text(create_partition_sql(table, month)))
+            await conn.execute(
+                text("INSERT INTO orders (id, total_amount, created_at, status) VALUES (:id, 1, '2001-01-15', 'pending')"),
+                {"id": order_id},
+            )
+            await conn.execute(
+                text("INSERT INTO order_items (id, order_id, order_created_at, quantity) VALUES (:id, :order, '2001-01-15', 1)"),
+                {"id": uuid.uuid4(), "order": order_id},
+            )
+        await engine.dispose()
+
+    asyncio.run(main())
+    """
+)
+
+ARCHIVE_CHECK = textwrap.dedent(
+    """
+    import asyncio
+    from sqlalchemy import text
+    from backend.db.partitions import list_partitions
+    from backend.db.session import engine
+
+    async def main():
+        async with engine.begin() as conn:
+            for table in ("orders", "order_items"):
+                assert f"{table}_p2001_01" not in await list_partitions(conn, table)
+                assert (await conn.execute(text(f"SELECT count(*) FROM {table}_p2001_01"))).scalar() == 1
+            # Newer Postgres refuses to detach orders while this FK exists;
+            # older releases allow it and leave it pointing at nothing
+            foreign_keys = await conn.execute(text(
+                "SELECT count(*) FROM pg_constraint "
+                "WHERE conrelid = CAST('order_items_p2001_01' AS regclass) AND contype = 'f'"
+            ))
+            assert foreign_keys.scalar() == 0
+            for table in ("order_items", "orders"):
+                await conn.execute(text(f"DROP TABLE {table}_p2001_01"))
+        await engine.dispose()
+        print("detached")
+
+    asyncio.run(main())
+    """
+)
+
+
+def run(*args):
+    # Separate processes: the rest of the suite has the app bound to SQLite
+    return subprocess.run(
+        [sys.executable, *args],
+        cwd=ROOT,
+        env={**os.environ, "DATABASE_URL": DATABASE_URL},
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+
+
+def test_rows_in_the_default_partition_move_into_a_new_month():
+    result = run("-c", SCRIPT)
+    assert result.returncode == 0, result.stdout + result.stderr
+    assert "moved" in result.stdout
+
+
+def test_archive_detaches_a_month_with_rows_without_dropping_it(tmp_path):
+    setup = run("-c", ARCHIVE_SETUP)
+    assert setup.returncode == 0, setup.stdout + setup.stderr
+
+    today = date.today()
+    older_than = (today.year - 2001) * 12 + today.month - 2
+    archive = run(
+        "-m", "backend.scripts.archive_orders",
+        "--older-than-months", str(older_than), "--out-dir", str(tmp_path),
+    )
+    assert archive.returncode == 0, archive.stdout + archive.stderr
+    assert (tmp_path / "orders_p2001_01.csv.gz").exists()
+    assert (tmp_path / "order_items_p2001_01.csv.gz").exists()
+
+    check = run("-c", ARCHIVE_CHECK)
+    assert check.returncode == 0, check.stdout + check.stderr
+    assert "detached" in check.stdout
@@ -0,0 +1,16 @@
+import pytest
+
+from backend.db.session import pool_budget
+
+
+def test_workers_share_the_connection_budget():
+    assert pool_budget(30, 1) == (10, 20)
+    for workers in (1, 4, 7, 30):
+        pool_size, max_overflow = pool_budget(30, workers)
+        assert pool_size >= 1
+        assert (pool_size + max_overflow) * workers <= 30
+
+
+def test_more_workers_than_connections_is_refused():
+    with pytest.raises(RuntimeError, match="DB_MAX_CONNECTIONS"):
+        pool_budget(30, 31)
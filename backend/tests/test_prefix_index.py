@@ -0,0 +1,50 @@
+import uuid
+
+from backend.core.prefix_index import PrefixIndex
+
+
+def test_popular_match_beyond_many_alphabetical_ones_ranks_first():
+    index = PrefixIndex()
+    items = [(uuid.uuid4(), f"Shoe {n:05d}", 1) for n in range(5000)]
+    popular = (uuid.uuid4(), "Shoe zz top seller", 100)
+    index.replace(items + [popular])
+
+    results = index.search("sho", limit=3)
+    assert results[0] == {"id": popular[0], "name": popular[1]}
+    assert [r["name"] for r in results[1:]] == ["Shoe 00000", "Shoe 00001"]
+
+
+def test_search_matches_any_word_and_stops_at_the_prefix_range():
+    index = PrefixIndex()
+    running, shirt, other = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    index.replace([(running, "Elite Running Shoes", 5), (shirt, "Running Shirt", 1), (other, "Rug", 9)])
+
+    assert [r["id"] for r in index.search("run")] == [running, shirt]
+    assert [r["id"] for r in index.search("shoes")] == [running]
+
+    index.bump(shirt, 10)
+    index.remove(running)
+    assert [r["id"] for r in index.search("run")] == [shirt]
+    assert index.search("   ") == []
+
+
+def test_precomputed_short_prefixes_follow_updates():
+    index = PrefixIndex(top_k=2)
+    ids = [uuid.uuid4() for _ in range(4)]
+    index.replace([(ids[0], "Sock", 3), (ids[1], "Sandal", 2), (ids[2], "Scarf", 1)])
+    assert [r["id"] for r in index.search("s", limit=2)] == [ids[0], ids[1]]
+
+    # Checkout bumps promote into the precomputed list
+    index.bump(ids[2], 5)
+    assert [r["id"] for r in index.search("s", limit=2)] == [ids[2], ids[0]]
+
+    # Removing a listed item refills the list from the full range
+    index.remove(ids[2])
+    assert [r["id"] for r in index.search("s", limit=2)] == [ids[0], ids[1]]
+
+    index.add(ids[3], "Slipper", 10)
+    index.bump(ids[0], -3)
+    assert [r["id"] for r in index.search("s", limit=2)] == [ids[3], ids[1]]
+    assert [r["id"] for r in index.search("sl")] == [ids[3]]
+    # Limits beyond the precomputed lists still rank the whole range
+    assert len(index.search("s", limit=5)) == 3
@@ -0,0 +1,58 @@
+from sqlalchemy import select
+
+from backend.crud.recommendations import rebuild_cooccurrence
+from backend.models import Product, ProductCooccurrence
+
+
+async def test_rebuild_matches_checkout_counts(client, db, user_headers, product):
+    other = Product(name="Laces", price=2.0, is_active=True)
+    db.add(other)
+    await db.commit()
+
+    for _ in range(2):
+        for product_id in (product.id, other.id):
+            await client.post(f"/cart/add/{product_id}", headers=user_headers)
+        assert (await client.post("/orders/checkout", headers=user_headers)).status_code == 200
+
+    async def scores():
+        result = await db.execute(
+            select(ProductCooccurrence.related_product_id, ProductCooccurrence.score)
+            .where(ProductCooccurrence.product_id == product.id)
+        )
+        return dict(result.all())
+
+    # Checkout maintains the index incrementally; the rebuild must agree
+    # instead of counting the same orders again
+    assert await scores() == {other.id: 2}
+    await rebuild_cooccurrence(db, log=lambda message: None)
+    assert await scores() == {other.id: 2}
+
+    related = (await client.get(f"/products/{product.id}/related")).json()
+    assert [p["id"] for p in related] == [str(other.id)]
+
+
+async def test_rebuild_caps_large_orders_and_prunes_the_current_month(client, db, user_headers):
+    products = [Product(name=f"Basket item {n}", price=1.0, is_active=True) for n in range(25)]
+    db.add_all(products)
+    await db.commit()
+
+    for product in products:
+        await client.post(f"/cart/add/{product.id}", headers=user_headers)
+    assert (await client.post("/orders/checkout", headers=user_headers)).status_code == 200
+
+    async def everything():
+        result = await db.execute(
+            select(ProductCooccurrence.product_id, ProductCooccurrence.related_product_id, ProductCooccurrence.score)
+        )
+        return sorted(result.all())
+
+    # Checkout only pairs up MAX_PAIR_PRODUCTS of the 25; so must the rebuild
+    incremental = await everything()
+    await rebuild_cooccurrence(db, keep=1000, log=lambda message: None)
+    assert await everything() == incremental
+
+    await rebuild_cooccurrence(db, keep=5, log=lambda message: None)
+    counts = {}
+    for product_id, _, _ in await everything():
+        counts[product_id] = counts.get(product_id, 0) + 1
+    assert max(counts.values()) == 5
@@ -0,0 +1,24 @@
+from sqlalchemy import func, select
+
+from backend.benchmarks.seed import build_parser, row_count, seed
+from backend.models import DailySales, Order, Product
+
+
+def test_explicit_zero_counts_are_kept():
+    args = build_parser().parse_args(["--categories", "0", "--orders", "0", "--scale", "2"])
+    assert row_count(args, "categories", scaled=False) == 0
+    assert row_count(args, "orders") == 0
+    assert row_count(args, "users") == 2000
+
+
+async def test_seed_small_dataset(db):
+    orders_before = (await db.execute(select(func.count()).select_from(Order))).scalar_one()
+
+    await seed(users=3, categories=0, products=10, carts=2, orders=5, history_days=30,
+               seed_value=7, log=lambda message: None)
+
+    assert (await db.execute(select(func.count()).select_from(Order))).scalar_one() == orders_before + 5
+    seeded = select(func.count()).where(Product.description.like("Seeded benchmark product%"))
+    assert (await db.execute(seeded)).scalar_one() == 10
+    # seed() finishes with a rollup rebuild
+    assert (await db.execute(select(func.sum(DailySales.order_count)))).scalar_one() == orders_before + 5